@@ -7,19 +7,84 @@ Author: VaultSphere Development Team
 Date: 2025-09-25
 """
 
+import sys
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 from collections import Counter
+from convert_logs_to_parquet import load_logs
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; burst detection falls back to per-user searchsorted
+    njit = None
+
+def _first_burst_windows(user_codes, timestamps_ns, window_ns, threshold):
+    """Two-pointer scan over failures sorted by (user, timestamp).
+    
+    Returns the [start, end) row range of the first window per user that
+    holds at least `threshold` failures within `window_ns` of its first attempt.
+    """
+    n = len(timestamps_ns)
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    found = 0
+    i = 0
+    j = 0
+    while i < n:
+        user = user_codes[i]
+        if j < i:
+            j = i
+        while j < n and user_codes[j] == user and timestamps_ns[j] <= timestamps_ns[i] + window_ns:
+            j += 1
+        if j - i >= threshold:
+            starts[found] = i
+            ends[found] = j
+            found += 1
+            # Only report the first burst per user
+            while i < n and user_codes[i] == user:
+                i += 1
+        else:
+            i += 1
+    return starts[:found], ends[:found]
+
+if njit is not None:
+    _first_burst_windows = njit(cache=True)(_first_burst_windows)
+
+def _first_burst_windows_searchsorted(user_codes, timestamps_ns, window_ns, threshold):
+    """NumPy fallback for `_first_burst_windows` using searchsorted within each user's rows."""
+    bounds = np.flatnonzero(np.diff(user_codes)) + 1
+    group_starts = np.concatenate(([0], bounds))
+    group_ends = np.concatenate((bounds, [len(user_codes)]))
+    starts = []
+    ends = []
+    for group_start, group_end in zip(group_starts, group_ends):
+        if group_end - group_start < threshold:
+            continue
+        user_times = timestamps_ns[group_start:group_end]
+        window_ends = np.searchsorted(user_times, user_times + window_ns, side='right')
+        hits = np.flatnonzero(window_ends - np.arange(len(user_times)) >= threshold)
+        if len(hits) > 0:
+            starts.append(group_start + hits[0])
+            ends.append(group_start + window_ends[hits[0]])
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
 class VaultSphereAnomalyDetector:
     def __init__(self, csv_file='synthetic_vaultsphere_logs.csv'):
         """Initialize the anomaly detector with the log data"""
         print("🔍 Loading VaultSphere logs for anomaly detection...")
-        self.df = pd.read_csv(csv_file)
-        self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
+        self.df = load_logs(csv_file)
+        
+        # Sort once so every per-user scan sees contiguous, time-ordered rows
+        self.df.sort_values(['user_id', 'timestamp'], inplace=True, kind='mergesort', ignore_index=True)
+        
+        # Hour-of-day features shared by the detectors (off-hours: 11 PM to 5 AM)
+        self.df['hour'] = self.df['timestamp'].dt.hour.astype('int8')
+        self.df['is_off_hours'] = self.df['hour'].isin([23, 0, 1, 2, 3, 4, 5]).to_numpy()
+        
+        # Each user belongs to a single tenant, so resolve tenants through one lookup table
+        self._user_tenant = self.df.drop_duplicates('user_id').set_index('user_id')['tenant_id']
         print(f"Loaded {len(self.df):,} events from {csv_file}")
         
     def detect_failed_login_bursts(self, threshold=10, time_window_minutes=60):
@@ -28,61 +93,57 @@ class VaultSphereAnomalyDetector:
         print("-" * 70)
         
         # Filter failed login attempts
-        failed_logins = self.df[
+        failed_logins = self.df.loc[
             (self.df['event_type'] == 'LOGIN') & 
-            (self.df['status'] == 'FAILURE')
-        ].copy()
+            (self.df['status'] == 'FAILURE'),
+            ['timestamp', 'user_id', 'ip_address']
+        ]
         
         if failed_logins.empty:
             print("No failed login attempts found.")
             return []
         
-        # Group by user and analyze time windows
+        # Find the first burst window per user; rows are already sorted by (user, timestamp)
+        find_bursts = _first_burst_windows if njit is not None else _first_burst_windows_searchsorted
+        timestamps = failed_logins['timestamp'].to_numpy()
+        starts, ends = find_bursts(
+            failed_logins['user_id'].cat.codes.to_numpy(),
+            timestamps.astype('datetime64[ns]').view(np.int64),
+            pd.Timedelta(minutes=time_window_minutes).value,
+            threshold
+        )
+        
+        user_ids = failed_logins['user_id'].to_numpy()
+        ip_addresses = failed_logins['ip_address'].to_numpy()
         anomalies = []
         
-        for user_id in failed_logins['user_id'].unique():
-            user_failures = failed_logins[failed_logins['user_id'] == user_id].sort_values('timestamp')
+        for start, end in zip(starts, ends):
+            user_id = user_ids[start]
+            burst_ips = pd.unique(ip_addresses[start:end])
             
-            if len(user_failures) < threshold:
-                continue
-                
-            # Check for bursts within time windows
-            for i in range(len(user_failures)):
-                window_start = user_failures.iloc[i]['timestamp']
-                window_end = window_start + timedelta(minutes=time_window_minutes)
-                
-                window_failures = user_failures[
-                    (user_failures['timestamp'] >= window_start) & 
-                    (user_failures['timestamp'] <= window_end)
-                ]
-                
-                if len(window_failures) >= threshold:
-                    # Get unique IPs in this burst
-                    burst_ips = window_failures['ip_address'].unique()
-                    
-                    anomaly = {
-                        'user_id': user_id,
-                        'tenant_id': user_failures.iloc[0]['tenant_id'],
-                        'start_time': window_start,
-                        'end_time': window_failures['timestamp'].max(),
-                        'failure_count': len(window_failures),
-                        'unique_ips': len(burst_ips),
-                        'suspicious_ips': list(burst_ips)
-                    }
-                    anomalies.append(anomaly)
-                    break  # Only report the first burst per user
+            anomaly = {
+                'user_id': user_id,
+                'tenant_id': self._user_tenant[user_id],
+                'start_time': pd.Timestamp(timestamps[start]),
+                'end_time': pd.Timestamp(timestamps[end - 1]),
+                'failure_count': int(end - start),
+                'unique_ips': len(burst_ips),
+                'suspicious_ips': list(burst_ips)
+            }
+            anomalies.append(anomaly)
         
         # Display results
         if anomalies:
-            print(f"Found {len(anomalies)} potential brute force attacks:")
+            lines = [f"Found {len(anomalies)} potential brute force attacks:"]
             for i, anomaly in enumerate(anomalies, 1):
                 duration = (anomaly['end_time'] - anomaly['start_time']).total_seconds() / 60
-                print(f"\n  {i}. User: {anomaly['user_id']} (Tenant {anomaly['tenant_id']})")
-                print(f"     Time: {anomaly['start_time'].strftime('%Y-%m-%d %H:%M')} - {anomaly['end_time'].strftime('%H:%M')}")
-                print(f"     Duration: {duration:.1f} minutes")
-                print(f"     Failed attempts: {anomaly['failure_count']}")
-                print(f"     Unique IPs: {anomaly['unique_ips']}")
-                print(f"     IPs: {', '.join(anomaly['suspicious_ips'][:3])}{'...' if len(anomaly['suspicious_ips']) > 3 else ''}")
+                lines.append(f"\n  {i}. User: {anomaly['user_id']} (Tenant {anomaly['tenant_id']})")
+                lines.append(f"     Time: {anomaly['start_time'].strftime('%Y-%m-%d %H:%M')} - {anomaly['end_time'].strftime('%H:%M')}")
+                lines.append(f"     Duration: {duration:.1f} minutes")
+                lines.append(f"     Failed attempts: {anomaly['failure_count']}")
+                lines.append(f"     Unique IPs: {anomaly['unique_ips']}")
+                lines.append(f"     IPs: {', '.join(anomaly['suspicious_ips'][:3])}{'...' if len(anomaly['suspicious_ips']) > 3 else ''}")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("No failed login bursts detected.")
             
@@ -93,56 +154,42 @@ class VaultSphereAnomalyDetector:
         print(f"\n🔍 Detecting Unusual Event Types")
         print("-" * 70)
         
-        # Calculate typical event distribution per user
-        user_profiles = {}
-        
-        for user_id in self.df['user_id'].unique():
-            user_events = self.df[self.df['user_id'] == user_id]
-            event_counts = user_events['event_type'].value_counts()
-            total_events = len(user_events)
-            
-            # Calculate event type percentages
-            event_percentages = {}
-            for event_type in ['LOGIN', 'CREATE', 'UPDATE', 'DELETE', 'DOWNLOAD']:
-                count = event_counts.get(event_type, 0)
-                percentage = (count / total_events) * 100 if total_events > 0 else 0
-                event_percentages[event_type] = percentage
-            
-            user_profiles[user_id] = {
-                'total_events': total_events,
-                'event_percentages': event_percentages,
-                'tenant_id': user_events.iloc[0]['tenant_id']
-            }
+        # Calculate typical event distribution per user in a single pass
+        event_counts = pd.crosstab(self.df['user_id'], self.df['event_type'])
+        totals = event_counts.sum(axis=1)
+        delete_counts = event_counts.reindex(columns=['DELETE'], fill_value=0)['DELETE']
+        delete_percentages = delete_counts.div(totals).mul(100)
         
         # Detect anomalies - users with unusually high DELETE percentages
+        # Flag users with >2% DELETE events (unusual for most roles)
+        mask = (delete_percentages > 2.0) & (totals > 50)
+        flagged = delete_percentages.index[mask]
+        
         anomalies = []
         
-        for user_id, profile in user_profiles.items():
-            delete_percentage = profile['event_percentages']['DELETE']
-            
-            # Flag users with >2% DELETE events (unusual for most roles)
-            if delete_percentage > 2.0 and profile['total_events'] > 50:
-                delete_count = int((delete_percentage / 100) * profile['total_events'])
-                
-                anomaly = {
-                    'user_id': user_id,
-                    'tenant_id': profile['tenant_id'],
-                    'delete_percentage': delete_percentage,
-                    'delete_count': delete_count,
-                    'total_events': profile['total_events']
-                }
-                anomalies.append(anomaly)
+        for user_id, delete_percentage, delete_count, total_events in zip(
+            flagged, delete_percentages[mask], delete_counts[mask], totals[mask]
+        ):
+            anomaly = {
+                'user_id': user_id,
+                'tenant_id': self._user_tenant[user_id],
+                'delete_percentage': delete_percentage,
+                'delete_count': int(delete_count),
+                'total_events': int(total_events)
+            }
+            anomalies.append(anomaly)
         
         # Sort by delete percentage
         anomalies.sort(key=lambda x: x['delete_percentage'], reverse=True)
         
         # Display results
         if anomalies:
-            print(f"Found {len(anomalies)} users with unusual DELETE activity:")
+            lines = [f"Found {len(anomalies)} users with unusual DELETE activity:"]
             for i, anomaly in enumerate(anomalies[:10], 1):  # Show top 10
-                print(f"\n  {i}. User: {anomaly['user_id']} (Tenant {anomaly['tenant_id']})")
-                print(f"     DELETE events: {anomaly['delete_count']} ({anomaly['delete_percentage']:.1f}% of {anomaly['total_events']} total)")
-                print(f"     Risk: {'HIGH' if anomaly['delete_percentage'] > 5 else 'MEDIUM'}")
+                lines.append(f"\n  {i}. User: {anomaly['user_id']} (Tenant {anomaly['tenant_id']})")
+                lines.append(f"     DELETE events: {anomaly['delete_count']} ({anomaly['delete_percentage']:.1f}% of {anomaly['total_events']} total)")
+                lines.append(f"     Risk: {'HIGH' if anomaly['delete_percentage'] > 5 else 'MEDIUM'}")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("No unusual event type patterns detected.")
             
@@ -153,61 +200,59 @@ class VaultSphereAnomalyDetector:
         print(f"\n🌐 Detecting Suspicious IP Access")
         print("-" * 70)
         
-        # Analyze IP patterns per user
-        user_ip_profiles = {}
+        # Analyze IP patterns per user from one (user, IP) count table
+        pair_counts = self.df.groupby(['user_id', 'ip_address'], sort=False, observed=True).size()
+        totals = pair_counts.groupby(level='user_id', sort=False, observed=True).sum()
+        unique_ips = pair_counts.groupby(level='user_id', sort=False, observed=True).size()
         
-        for user_id in self.df['user_id'].unique():
-            user_events = self.df[self.df['user_id'] == user_id]
-            ip_counts = user_events['ip_address'].value_counts()
-            
-            # Identify primary IPs (used >10% of the time)
-            total_events = len(user_events)
-            primary_ips = []
-            suspicious_ips = []
-            
-            for ip, count in ip_counts.items():
-                percentage = (count / total_events) * 100
-                if percentage > 10:
-                    primary_ips.append(ip)
-                elif count >= 3:  # IPs used multiple times but infrequently
-                    suspicious_ips.append((ip, count))
-            
-            user_ip_profiles[user_id] = {
-                'tenant_id': user_events.iloc[0]['tenant_id'],
-                'total_events': total_events,
-                'unique_ips': len(ip_counts),
-                'primary_ips': primary_ips,
-                'suspicious_ips': suspicious_ips
-            }
+        pair_counts = pair_counts.sort_values(ascending=False, kind='stable')
+        user_level = pair_counts.index.get_level_values('user_id')
+        percentages = pair_counts / totals.reindex(user_level).to_numpy() * 100
+        
+        # Identify primary IPs (used >10% of the time) and IPs used multiple times but infrequently
+        primary = pair_counts[percentages > 10]
+        suspicious = pair_counts[(percentages <= 10) & (pair_counts >= 3)]
+        
+        primary_ips = pd.Series(
+            primary.index.get_level_values('ip_address').to_numpy(),
+            index=primary.index.get_level_values('user_id')
+        ).groupby(level='user_id', observed=True).agg(list)
+        suspicious_ips = pd.Series(
+            list(zip(suspicious.index.get_level_values('ip_address'), suspicious.to_numpy())),
+            index=suspicious.index.get_level_values('user_id')
+        ).groupby(level='user_id', observed=True).agg(list)
+        suspicious_counts = suspicious_ips.str.len().reindex(unique_ips.index, fill_value=0)
         
         # Detect anomalies
+        # Flag users with many unique IPs or suspicious access patterns
+        flagged = unique_ips.index[(unique_ips > 5) | (suspicious_counts > 2)]
+        
         anomalies = []
         
-        for user_id, profile in user_ip_profiles.items():
-            # Flag users with many unique IPs or suspicious access patterns
-            if profile['unique_ips'] > 5 or len(profile['suspicious_ips']) > 2:
-                anomaly = {
-                    'user_id': user_id,
-                    'tenant_id': profile['tenant_id'],
-                    'unique_ips': profile['unique_ips'],
-                    'primary_ips': profile['primary_ips'],
-                    'suspicious_ips': profile['suspicious_ips'][:5],  # Top 5
-                    'total_events': profile['total_events']
-                }
-                anomalies.append(anomaly)
+        for user_id in flagged:
+            anomaly = {
+                'user_id': user_id,
+                'tenant_id': self._user_tenant[user_id],
+                'unique_ips': int(unique_ips[user_id]),
+                'primary_ips': primary_ips.get(user_id, []),
+                'suspicious_ips': suspicious_ips.get(user_id, [])[:5],  # Top 5
+                'total_events': int(totals[user_id])
+            }
+            anomalies.append(anomaly)
         
         # Sort by number of unique IPs
         anomalies.sort(key=lambda x: x['unique_ips'], reverse=True)
         
         # Display results
         if anomalies:
-            print(f"Found {len(anomalies)} users with suspicious IP patterns:")
+            lines = [f"Found {len(anomalies)} users with suspicious IP patterns:"]
             for i, anomaly in enumerate(anomalies[:10], 1):  # Show top 10
-                print(f"\n  {i}. User: {anomaly['user_id']} (Tenant {anomaly['tenant_id']})")
-                print(f"     Unique IPs: {anomaly['unique_ips']} across {anomaly['total_events']} events")
-                print(f"     Primary IPs: {len(anomaly['primary_ips'])}")
+                lines.append(f"\n  {i}. User: {anomaly['user_id']} (Tenant {anomaly['tenant_id']})")
+                lines.append(f"     Unique IPs: {anomaly['unique_ips']} across {anomaly['total_events']} events")
+                lines.append(f"     Primary IPs: {len(anomaly['primary_ips'])}")
                 if anomaly['suspicious_ips']:
-                    print(f"     Suspicious IPs: {', '.join([f'{ip}({count})' for ip, count in anomaly['suspicious_ips'][:3]])}")
+                    lines.append(f"     Suspicious IPs: {', '.join([f'{ip}({count})' for ip, count in anomaly['suspicious_ips'][:3]])}")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("No suspicious IP access patterns detected.")
             
@@ -218,49 +263,39 @@ class VaultSphereAnomalyDetector:
         print(f"\n🌙 Detecting Off-Hours Activity")
         print("-" * 70)
         
-        # Add hour column
-        self.df['hour'] = self.df['timestamp'].dt.hour
-        
-        # Define off-hours (11 PM to 5 AM)
-        off_hours = [23, 0, 1, 2, 3, 4, 5]
-        
-        # Analyze off-hours activity per user
+        # Analyze off-hours activity per user with one grouped pass over the categorical user codes
+        user_activity = self.df.groupby('user_id', sort=False, observed=True)['is_off_hours'].agg(['size', 'sum'])
+        off_hours_by_user = self.df[self.df['is_off_hours']].groupby('user_id', sort=False, observed=True)
         user_off_hours = {}
         
-        for user_id in self.df['user_id'].unique():
-            user_events = self.df[self.df['user_id'] == user_id]
-            total_events = len(user_events)
-            
-            off_hours_events = user_events[user_events['hour'].isin(off_hours)]
-            off_hours_count = len(off_hours_events)
-            off_hours_percentage = (off_hours_count / total_events) * 100 if total_events > 0 else 0
-            
-            if off_hours_count > 5:  # Users with >5 off-hours events
-                user_off_hours[user_id] = {
-                    'tenant_id': user_events.iloc[0]['tenant_id'],
-                    'total_events': total_events,
-                    'off_hours_count': off_hours_count,
-                    'off_hours_percentage': off_hours_percentage,
-                    'off_hours_events': off_hours_events
-                }
+        # Users with >5 off-hours events
+        for user_id, total_events, off_hours_count in user_activity[user_activity['sum'] > 5].itertuples():
+            user_off_hours[user_id] = {
+                'tenant_id': self._user_tenant[user_id],
+                'total_events': int(total_events),
+                'off_hours_count': int(off_hours_count),
+                'off_hours_percentage': (off_hours_count / total_events) * 100,
+                'off_hours_events': off_hours_by_user.get_group(user_id)
+            }
         
         # Sort by off-hours percentage
         anomalies = sorted(user_off_hours.items(), key=lambda x: x[1]['off_hours_percentage'], reverse=True)
         
         # Display results
         if anomalies:
-            print(f"Found {len(anomalies)} users with significant off-hours activity:")
+            lines = [f"Found {len(anomalies)} users with significant off-hours activity:"]
             for i, (user_id, data) in enumerate(anomalies[:10], 1):  # Show top 10
-                print(f"\n  {i}. User: {user_id} (Tenant {data['tenant_id']})")
-                print(f"     Off-hours events: {data['off_hours_count']} ({data['off_hours_percentage']:.1f}% of {data['total_events']} total)")
+                lines.append(f"\n  {i}. User: {user_id} (Tenant {data['tenant_id']})")
+                lines.append(f"     Off-hours events: {data['off_hours_count']} ({data['off_hours_percentage']:.1f}% of {data['total_events']} total)")
                 
                 # Show event type distribution during off-hours
                 event_types = data['off_hours_events']['event_type'].value_counts()
-                print(f"     Event types: {', '.join([f'{et}({count})' for et, count in event_types.head(3).items()])}")
+                lines.append(f"     Event types: {', '.join([f'{et}({count})' for et, count in event_types.head(3).items()])}")
                 
                 # Show time pattern
                 hours = data['off_hours_events']['hour'].value_counts().sort_index()
-                print(f"     Peak hours: {', '.join([f'{h}:00({count})' for h, count in hours.head(3).items()])}")
+                lines.append(f"     Peak hours: {', '.join([f'{h}:00({count})' for h, count in hours.head(3).items()])}")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("No significant off-hours activity detected.")
             
@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from collections import Counter
+from convert_logs_to_parquet import load_logs
 
 def analyze_dataset(filename, tenant_name):
     """Analyze a single dataset for anomalies and patterns"""
@@ -15,46 +16,63 @@ def analyze_dataset(filename, tenant_name):
     print("=" * 60)
     
     # Load dataset
-    df = pd.read_csv(filename)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['hour'] = df['timestamp'].dt.hour
+    df = load_logs(filename)
+    df['hour'] = df['timestamp'].dt.hour.astype('int8')
+    
+    # Precompute the row flags shared by every section below
+    hours = df['hour'].to_numpy()
+    is_success = df['status'].eq('SUCCESS').to_numpy()
+    is_failure = df['status'].eq('FAILURE').to_numpy()
+    is_login_failure = df['event_type'].eq('LOGIN').to_numpy() & is_failure
+    is_business = (hours >= 9) & (hours <= 17)
+    is_night = (hours >= 23) | (hours <= 5)
+    
+    # One pass over the frame for event totals and one for per-user counters
+    event_counts = df.groupby('event_type', observed=True).size()
+    user_stats = pd.DataFrame({
+        'login_failures': is_login_failure,
+        'complaints': df['event_type'].eq('COMPLAINT').to_numpy(),
+        'admin_actions': df['event_type'].eq('ADMIN_ACTION').to_numpy()
+    }, index=df.index).groupby(df['user_id'], observed=True).sum()
+    
+    total_events = len(df)
     
     # Basic statistics
     print(f"📊 Basic Statistics:")
-    print(f"  Total Events: {len(df):,}")
-    print(f"  Users: {df['user_id'].nunique()}")
+    print(f"  Total Events: {total_events:,}")
+    print(f"  Users: {len(user_stats)}")
     print(f"  Date Range: {df['timestamp'].min()} to {df['timestamp'].max()}")
-    print(f"  Success Rate: {(df['status'] == 'SUCCESS').mean():.1%}")
-    print(f"  Failure Rate: {(df['status'] == 'FAILURE').mean():.1%}")
+    print(f"  Success Rate: {is_success.mean():.1%}")
+    print(f"  Failure Rate: {is_failure.mean():.1%}")
     print(f"  Unique IPs: {df['ip_address'].nunique()}")
     
     # Event type distribution
     print(f"\n📈 Event Type Distribution:")
-    event_dist = df['event_type'].value_counts()
+    event_dist = event_counts.sort_values(ascending=False)
     for event_type, count in event_dist.items():
-        percentage = (count / len(df)) * 100
+        percentage = (count / total_events) * 100
         print(f"  {event_type}: {count:,} ({percentage:.1f}%)")
     
     # Time pattern analysis
     print(f"\n⏰ Time Pattern Analysis:")
-    business_hours = df[(df['hour'] >= 9) & (df['hour'] <= 17)]
-    off_hours = df[(df['hour'] < 9) | (df['hour'] > 17)]
-    night_hours = df[(df['hour'] >= 23) | (df['hour'] <= 5)]
+    business_hours = int(is_business.sum())
+    off_hours = total_events - business_hours
+    night_hours = int(is_night.sum())
     
-    print(f"  Business Hours (9 AM - 5 PM): {len(business_hours):,} ({len(business_hours)/len(df)*100:.1f}%)")
-    print(f"  Off Hours: {len(off_hours):,} ({len(off_hours)/len(df)*100:.1f}%)")
-    print(f"  Night Hours (11 PM - 5 AM): {len(night_hours):,} ({len(night_hours)/len(df)*100:.1f}%)")
+    print(f"  Business Hours (9 AM - 5 PM): {business_hours:,} ({business_hours/total_events*100:.1f}%)")
+    print(f"  Off Hours: {off_hours:,} ({off_hours/total_events*100:.1f}%)")
+    print(f"  Night Hours (11 PM - 5 AM): {night_hours:,} ({night_hours/total_events*100:.1f}%)")
     
     # Failed login burst analysis
     print(f"\n🚨 Failed Login Burst Analysis:")
-    failed_logins = df[(df['event_type'] == 'LOGIN') & (df['status'] == 'FAILURE')]
+    failed_logins = int(is_login_failure.sum())
     
-    if len(failed_logins) > 0:
-        # Group by user and count consecutive failures
-        user_failures = failed_logins.groupby('user_id').size().sort_values(ascending=False)
+    if failed_logins > 0:
+        # Count failures per user
+        user_failures = user_stats['login_failures'].sort_values(ascending=False)
         burst_users = user_failures[user_failures >= 10]  # Users with 10+ failed logins
         
-        print(f"  Total Failed Logins: {len(failed_logins):,}")
+        print(f"  Total Failed Logins: {failed_logins:,}")
         print(f"  Users with Login Bursts (10+ failures): {len(burst_users)}")
         
         if len(burst_users) > 0:
@@ -64,10 +82,9 @@ def analyze_dataset(filename, tenant_name):
     
     # Suspicious IP analysis
     print(f"\n🌐 IP Address Analysis:")
-    ip_stats = df.groupby('ip_address').agg({
-        'status': lambda x: (x == 'FAILURE').sum(),
-        'user_id': 'count'
-    }).rename(columns={'status': 'failures', 'user_id': 'total_events'})
+    ip_stats = pd.DataFrame({'failure': is_failure.astype('int32')}, index=df.index).groupby(
+        df['ip_address'], observed=True
+    ).agg(failures=('failure', 'sum'), total_events=('failure', 'size'))
     
     ip_stats['failure_rate'] = ip_stats['failures'] / ip_stats['total_events']
     suspicious_ips = ip_stats[ip_stats['failure_rate'] > 0.5]  # >50% failure rate
@@ -81,13 +98,12 @@ def analyze_dataset(filename, tenant_name):
             print(f"    {ip}: {stats['failures']}/{stats['total_events']} failures ({stats['failure_rate']:.1%})")
     
     # Tenant-specific anomaly analysis
-    if 'COMPLAINT' in df['event_type'].values:
+    if 'COMPLAINT' in event_counts.index:
         print(f"\n📞 Complaint Analysis (Food Company):")
-        complaints = df[df['event_type'] == 'COMPLAINT']
-        user_complaints = complaints.groupby('user_id').size().sort_values(ascending=False)
+        user_complaints = user_stats['complaints'].sort_values(ascending=False)
         excessive_complainers = user_complaints[user_complaints >= 8]  # 8+ complaints
         
-        print(f"  Total Complaints: {len(complaints):,}")
+        print(f"  Total Complaints: {event_counts['COMPLAINT']:,}")
         print(f"  Users with Excessive Complaints (8+): {len(excessive_complainers)}")
         
         if len(excessive_complainers) > 0:
@@ -95,12 +111,12 @@ def analyze_dataset(filename, tenant_name):
             for user, count in excessive_complainers.head(5).items():
                 print(f"    {user}: {count} complaints")
     
-    if 'ADMIN_ACTION' in df['event_type'].values:
+    if 'ADMIN_ACTION' in event_counts.index:
         print(f"\n🔐 Admin Action Analysis (IT Solutions):")
-        admin_actions = df[df['event_type'] == 'ADMIN_ACTION']
-        user_admin_actions = admin_actions.groupby('user_id').size().sort_values(ascending=False)
+        user_admin_actions = user_stats['admin_actions']
+        user_admin_actions = user_admin_actions[user_admin_actions > 0].sort_values(ascending=False)
         
-        print(f"  Total Admin Actions: {len(admin_actions):,}")
+        print(f"  Total Admin Actions: {event_counts['ADMIN_ACTION']:,}")
         print(f"  Users Performing Admin Actions: {len(user_admin_actions)}")
         
         if len(user_admin_actions) > 0:
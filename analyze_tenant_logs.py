@@ -8,49 +8,104 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from collections import Counter
+import pyarrow.parquet as pq
+from convert_logs_to_parquet import fresh_parquet_path
+from log_utils import LOG_COLUMNS, LOG_DTYPES
 
-def load_and_analyze_logs(filename='synthetic_vaultsphere_logs.csv'):
-    """Load and analyze the synthetic logs"""
+# Per-event attributes the reports need; streamed chunks are reduced to counts over these keys
+ACTIVITY_KEYS = ['tenant_id', 'user_id', 'event_type', 'status', 'hour']
+
+def _merge_counts(totals, counts):
+    """Fold one chunk's group counts into the running totals"""
+    if totals is None:
+        return counts
+    return pd.concat([totals, counts]).groupby(level=list(range(counts.index.nlevels)), observed=True).sum()
+
+def _iter_log_chunks(filename, chunksize):
+    """Yield the logs in chunks, from the Parquet copy when one is fresh"""
+    parquet_file = fresh_parquet_path(filename)
+    if parquet_file:
+        for batch in pq.ParquetFile(parquet_file).iter_batches(batch_size=chunksize, columns=LOG_COLUMNS):
+            yield batch.to_pandas().astype(LOG_DTYPES)
+    else:
+        yield from pd.read_csv(filename, chunksize=chunksize, usecols=LOG_COLUMNS, dtype=LOG_DTYPES, parse_dates=['timestamp'])
+
+def load_and_analyze_logs(filename='synthetic_vaultsphere_logs.csv', chunksize=1_000_000):
+    """Stream the synthetic logs in chunks and analyze the accumulated counts"""
     print("🔍 VaultSphere Tenant Log Analysis")
     print("=" * 50)
     
-    # Load the data
-    df = pd.read_csv(filename)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    # Reduce each chunk to event counts so peak memory tracks unique keys, not rows
+    activity = None
+    ip_activity = None
+    first_event = None
+    last_event = None
     
-    print(f"📊 Loaded {len(df):,} events from {filename}")
-    print(f"Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
+    for chunk in _iter_log_chunks(filename, chunksize):
+        chunk['hour'] = chunk['timestamp'].dt.hour.astype('int8')
+        activity = _merge_counts(activity, chunk.groupby(ACTIVITY_KEYS, observed=True).size())
+        ip_activity = _merge_counts(ip_activity, chunk.groupby(['ip_address', 'status'], observed=True).size())
+        
+        chunk_first, chunk_last = chunk['timestamp'].min(), chunk['timestamp'].max()
+        first_event = chunk_first if first_event is None else min(first_event, chunk_first)
+        last_event = chunk_last if last_event is None else max(last_event, chunk_last)
+    
+    activity = activity.rename('events').reset_index()
+    ip_activity = ip_activity.unstack('status', fill_value=0)
+    logs = {
+        'activity': activity,
+        'ip_activity': pd.DataFrame({
+            'total_events': ip_activity.sum(axis=1),
+            'failures': ip_activity.get('FAILURE', 0)
+        }),
+        'first_event': first_event,
+        'last_event': last_event
+    }
+    
+    print(f"📊 Loaded {activity['events'].sum():,} events from {filename}")
+    print(f"Date range: {first_event} to {last_event}")
     
     # Basic statistics
     print("\n🏢 Tenant Analysis:")
-    for tenant_id in sorted(df['tenant_id'].unique()):
-        tenant_data = df[df['tenant_id'] == tenant_id]
+    tenant_stats = activity.assign(
+        successes=activity['events'].where(activity['status'] == 'SUCCESS', 0)
+    ).groupby('tenant_id').agg(
+        events=('events', 'sum'),
+        users=('user_id', 'nunique'),
+        successes=('successes', 'sum')
+    )
+    event_counts = activity.groupby(['tenant_id', 'event_type'], observed=True)['events'].sum()
+    top_events = event_counts.sort_values(ascending=False).groupby(level='tenant_id').head(3)
+    
+    for tenant_id, stats in tenant_stats.iterrows():
         tenant_name = "Food Company" if tenant_id == 1 else "IT Solutions Company"
         
         print(f"\nTenant {tenant_id} ({tenant_name}):")
-        print(f"  Total events: {len(tenant_data):,}")
-        print(f"  Unique users: {tenant_data['user_id'].nunique()}")
-        print(f"  Success rate: {(tenant_data['status'] == 'SUCCESS').mean():.1%}")
+        print(f"  Total events: {stats['events']:,}")
+        print(f"  Unique users: {stats['users']}")
+        print(f"  Success rate: {stats['successes'] / stats['events']:.1%}")
         print(f"  Top event types:")
         
-        event_counts = tenant_data['event_type'].value_counts().head(3)
-        for event_type, count in event_counts.items():
-            percentage = (count / len(tenant_data)) * 100
+        for event_type, count in top_events.xs(tenant_id, level='tenant_id').items():
+            percentage = (count / stats['events']) * 100
             print(f"    {event_type}: {count:,} ({percentage:.1f}%)")
     
-    return df
+    return logs
 
-def detect_anomalies(df):
+def detect_anomalies(logs):
     """Detect various types of anomalies in the logs"""
     print("\n🚨 Anomaly Detection Results:")
     print("-" * 40)
     
+    activity = logs['activity']
+    user_tenant = activity.drop_duplicates('user_id').set_index('user_id')['tenant_id'].to_dict()
+    
     # 1. Failed login bursts
-    failed_logins = df[(df['event_type'] == 'LOGIN') & (df['status'] == 'FAILURE')]
+    failed_logins = activity[(activity['event_type'] == 'LOGIN') & (activity['status'] == 'FAILURE')]
     
     if not failed_logins.empty:
         # Group by user and count failures
-        user_failures = failed_logins.groupby('user_id').size()
+        user_failures = failed_logins.groupby('user_id')['events'].sum()
         suspicious_users = user_failures[user_failures >= 10]  # 10+ failed logins
         
         print(f"1. Failed Login Bursts:")
@@ -59,28 +114,28 @@ def detect_anomalies(df):
             print(f"   Max failures by single user: {user_failures.max()}")
             print(f"   Top suspicious users:")
             for user_id, count in suspicious_users.head(5).items():
-                tenant_id = df[df['user_id'] == user_id]['tenant_id'].iloc[0]
+                tenant_id = user_tenant[user_id]
                 tenant_name = "Food Company" if tenant_id == 1 else "IT Solutions"
                 print(f"     {user_id} ({tenant_name}): {count} failed logins")
     
     # 2. Off-hours activity (11 PM - 5 AM)
-    df['hour'] = df['timestamp'].dt.hour
-    off_hours_mask = (df['hour'] >= 23) | (df['hour'] <= 5)
-    off_hours_events = df[off_hours_mask]
+    off_hours_mask = (activity['hour'] >= 23) | (activity['hour'] <= 5)
+    off_hours_events = activity[off_hours_mask]
+    off_hours_total = off_hours_events['events'].sum()
     
     print(f"\n2. Off-Hours Activity (11 PM - 5 AM):")
-    print(f"   Total off-hours events: {len(off_hours_events):,}")
-    print(f"   Percentage of all events: {(len(off_hours_events) / len(df)) * 100:.1f}%")
+    print(f"   Total off-hours events: {off_hours_total:,}")
+    print(f"   Percentage of all events: {(off_hours_total / activity['events'].sum()) * 100:.1f}%")
     
     if not off_hours_events.empty:
-        off_hours_users = off_hours_events.groupby('user_id').size()
+        off_hours_users = off_hours_events.groupby('user_id')['events'].sum()
         active_users = off_hours_users[off_hours_users >= 5]  # 5+ off-hours events
         print(f"   Users with 5+ off-hours events: {len(active_users)}")
         
         if len(active_users) > 0:
             print(f"   Top off-hours users:")
             for user_id, count in active_users.head(5).items():
-                tenant_id = df[df['user_id'] == user_id]['tenant_id'].iloc[0]
+                tenant_id = user_tenant[user_id]
                 tenant_name = "Food Company" if tenant_id == 1 else "IT Solutions"
                 print(f"     {user_id} ({tenant_name}): {count} off-hours events")
     
@@ -88,9 +143,9 @@ def detect_anomalies(df):
     print(f"\n3. Tenant-Specific Anomalies:")
     
     # Food Company - excessive complaints
-    food_complaints = df[(df['tenant_id'] == 1) & (df['event_type'] == 'COMPLAINT')]
+    food_complaints = activity[(activity['tenant_id'] == 1) & (activity['event_type'] == 'COMPLAINT')]
     if not food_complaints.empty:
-        complaint_users = food_complaints.groupby('user_id').size()
+        complaint_users = food_complaints.groupby('user_id')['events'].sum()
         excessive_complainers = complaint_users[complaint_users >= 8]
         print(f"   Food Company - Users with 8+ complaints: {len(excessive_complainers)}")
         
@@ -99,26 +154,22 @@ def detect_anomalies(df):
             print(f"   Max complaints by single user: {max_complaints}")
     
     # IT Solutions - unauthorized admin actions
-    it_admin_actions = df[(df['tenant_id'] == 2) & (df['event_type'] == 'ADMIN_ACTION')]
+    it_admin_actions = activity[(activity['tenant_id'] == 2) & (activity['event_type'] == 'ADMIN_ACTION')]
     if not it_admin_actions.empty:
         admin_users = it_admin_actions['user_id'].nunique()
         print(f"   IT Solutions - Users performing admin actions: {admin_users}")
         
         # Check for non-admin users doing admin actions (this would be detected by role analysis)
-        admin_action_counts = it_admin_actions.groupby('user_id').size()
+        admin_action_counts = it_admin_actions.groupby('user_id')['events'].sum()
         frequent_admin_users = admin_action_counts[admin_action_counts >= 3]
         print(f"   Users with 3+ admin actions: {len(frequent_admin_users)}")
     
     # 4. Suspicious IP patterns
     print(f"\n4. IP Address Analysis:")
-    unique_ips = df['ip_address'].nunique()
-    print(f"   Total unique IP addresses: {unique_ips}")
+    ip_stats = logs['ip_activity'].copy()
+    print(f"   Total unique IP addresses: {len(ip_stats)}")
     
     # Look for IPs with high failure rates
-    ip_stats = df.groupby('ip_address').agg({
-        'status': ['count', lambda x: (x == 'FAILURE').sum()]
-    }).round(2)
-    ip_stats.columns = ['total_events', 'failures']
     ip_stats['failure_rate'] = (ip_stats['failures'] / ip_stats['total_events']).round(3)
     
     suspicious_ips = ip_stats[
@@ -131,30 +182,34 @@ def detect_anomalies(df):
         for ip, stats in suspicious_ips.head(5).iterrows():
             print(f"     {ip}: {stats['failure_rate']:.1%} failure rate ({stats['total_events']} events)")
 
-def generate_summary_report(df):
+def generate_summary_report(logs):
     """Generate a comprehensive summary report"""
     print("\n📋 Summary Report:")
     print("=" * 50)
     
+    activity = logs['activity']
+    
     # Overall statistics
-    total_events = len(df)
-    success_rate = (df['status'] == 'SUCCESS').mean()
+    total_events = activity['events'].sum()
+    success_rate = activity.loc[activity['status'] == 'SUCCESS', 'events'].sum() / total_events
     failure_rate = 1 - success_rate
     
     print(f"Dataset Overview:")
     print(f"  Total Events: {total_events:,}")
     print(f"  Success Rate: {success_rate:.1%}")
     print(f"  Failure Rate: {failure_rate:.1%}")
-    print(f"  Date Range: {(df['timestamp'].max() - df['timestamp'].min()).days} days")
+    print(f"  Date Range: {(logs['last_event'] - logs['first_event']).days} days")
     
     # Tenant comparison
     print(f"\nTenant Comparison:")
-    tenant_stats = df.groupby('tenant_id').agg({
-        'user_id': 'nunique',
-        'event_type': 'count',
-        'status': lambda x: (x == 'SUCCESS').mean()
+    tenant_activity = activity.assign(
+        successes=activity['events'].where(activity['status'] == 'SUCCESS', 0)
+    ).groupby('tenant_id')
+    tenant_stats = pd.DataFrame({
+        'users': tenant_activity['user_id'].nunique(),
+        'events': tenant_activity['events'].sum(),
+        'success_rate': tenant_activity['successes'].sum() / tenant_activity['events'].sum()
     }).round(3)
-    tenant_stats.columns = ['users', 'events', 'success_rate']
     
     for tenant_id, stats in tenant_stats.iterrows():
         tenant_name = "Food Company" if tenant_id == 1 else "IT Solutions Company"
@@ -164,13 +219,13 @@ def generate_summary_report(df):
         print(f"    Success Rate: {stats['success_rate']:.1%}")
     
     # Time patterns
-    df['hour'] = df['timestamp'].dt.hour
-    business_hours = df[(df['hour'] >= 9) & (df['hour'] <= 17)]
-    off_hours = df[(df['hour'] < 9) | (df['hour'] > 17)]
+    is_business = (activity['hour'] >= 9) & (activity['hour'] <= 17)
+    business_hours = activity.loc[is_business, 'events'].sum()
+    off_hours = activity.loc[~is_business, 'events'].sum()
     
     print(f"\nTime Patterns:")
-    print(f"  Business Hours (9 AM - 5 PM): {len(business_hours):,} events ({len(business_hours)/total_events:.1%})")
-    print(f"  Off Hours: {len(off_hours):,} events ({len(off_hours)/total_events:.1%})")
+    print(f"  Business Hours (9 AM - 5 PM): {business_hours:,} events ({business_hours/total_events:.1%})")
+    print(f"  Off Hours: {off_hours:,} events ({off_hours/total_events:.1%})")
     
     print(f"\n✅ Analysis completed successfully!")
     print(f"The dataset contains realistic patterns with injected anomalies suitable for")
@@ -180,13 +235,13 @@ def main():
     """Main analysis function"""
     try:
         # Load and analyze the logs
-        df = load_and_analyze_logs()
+        logs = load_and_analyze_logs()
         
         # Detect anomalies
-        detect_anomalies(df)
+        detect_anomalies(logs)
         
         # Generate summary report
-        generate_summary_report(df)
+        generate_summary_report(logs)
         
     except FileNotFoundError:
         print("❌ Error: synthetic_vaultsphere_logs.csv not found!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Convert VaultSphere log CSVs to Parquet for faster repeat analysis.
+The analysis scripts read the Parquet copy (pruned to the columns they need)
+whenever it is at least as new as the CSV, and fall back to the CSV otherwise.
+"""
+
+import os
+import pandas as pd
+from log_utils import LOG_COLUMNS, LOG_DTYPES
+
+# String columns with few distinct values are stored dictionary-encoded
+CATEGORICAL_COLUMNS = ['user_id', 'event_type', 'resource_id', 'status', 'ip_address']
+
+LOG_FILES = ['synthetic_vaultsphere_logs.csv', 'vaultsphere_food.csv', 'vaultsphere_it.csv']
+
+def parquet_path(csv_file):
+    """Return the Parquet path that sits alongside a log CSV"""
+    return os.path.splitext(csv_file)[0] + '.parquet'
+
+def fresh_parquet_path(csv_file):
+    """Return the Parquet copy of a log CSV if it exists and is not older than the CSV"""
+    parquet_file = parquet_path(csv_file)
+    if not os.path.exists(parquet_file):
+        return None
+    if os.path.exists(csv_file) and os.path.getmtime(parquet_file) < os.path.getmtime(csv_file):
+        return None
+    return parquet_file
+
+def load_logs(csv_file):
+    """Load the analysis columns of a log CSV, from its Parquet copy when that is fresh"""
+    parquet_file = fresh_parquet_path(csv_file)
+    if parquet_file:
+        return pd.read_parquet(parquet_file, columns=LOG_COLUMNS).astype(LOG_DTYPES)
+    return pd.read_csv(csv_file, engine='pyarrow', usecols=LOG_COLUMNS, dtype=LOG_DTYPES, parse_dates=['timestamp'])
+
+def convert_to_parquet(csv_file):
+    """Write a zstd-compressed Parquet copy of a log CSV and return its path"""
+    df = pd.read_csv(csv_file, engine='pyarrow', parse_dates=['timestamp'])
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    df['tenant_id'] = df['tenant_id'].astype('int8')
+
+    parquet_file = parquet_path(csv_file)
+    df.to_parquet(parquet_file, engine='pyarrow', compression='zstd', index=False)
+    return parquet_file
+
+def main():
+    """Convert every log CSV present in the working directory"""
+    print("📦 Converting VaultSphere logs to Parquet")
+    print("=" * 50)
+
+    for csv_file in LOG_FILES:
+        if not os.path.exists(csv_file):
+            print(f"  ⏭️  {csv_file} not found, skipping")
+            continue
+        parquet_file = convert_to_parquet(csv_file)
+        csv_size = os.path.getsize(csv_file) / 1024
+        parquet_size = os.path.getsize(parquet_file) / 1024
+        print(f"  ✅ {csv_file} ({csv_size:,.0f} KB) -> {parquet_file} ({parquet_size:,.0f} KB)")
+
+if __name__ == "__main__":
+    main()
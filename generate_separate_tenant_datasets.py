@@ -9,22 +9,65 @@ Date: 2025-09-25
 
 import pandas as pd
 import numpy as np
-from faker import Faker
-import random
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from datetime import datetime
 import ipaddress
 import os
+import io
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from convert_logs_to_parquet import CATEGORICAL_COLUMNS, parquet_path
+from log_utils import at_time_of_day, format_ipv4, pack_ipv4
 
-# Initialize Faker for generating realistic data
-fake = Faker()
-Faker.seed(42)  # For reproducible results
-random.seed(42)
-np.random.seed(42)
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the burst layout then runs as vectorized NumPy
+    njit = None
+
+# Output column order of the generated CSVs
+LOG_COLUMNS = ['timestamp', 'tenant_id', 'user_id', 'event_type', 'resource_id', 'status', 'ip_address']
+
+# Resources are numbered 1..NUM_RESOURCES during generation and only named RES_<n> when saved
+NUM_RESOURCES = 1000
+
+def _burst_layout(burst_start_ns, burst_duration_ns, time_draws, suspicious_draws, ip_draws,
+                  num_typical, num_suspicious):
+    """Lay out failed-login burst attempts from uniform [0, 1) draws.
+    
+    All inputs except num_suspicious are per attempt. Returns (timestamps_ns,
+    ip_indices, ip_is_suspicious); 60% of attempts come from the suspicious
+    pool, the rest from the attempting user's typical IPs.
+    """
+    timestamps_ns = burst_start_ns + (time_draws * burst_duration_ns).astype(np.int64)
+    ip_is_suspicious = suspicious_draws < 0.6
+    ip_indices = (ip_draws * np.where(ip_is_suspicious, num_suspicious, num_typical)).astype(np.int64)
+    return timestamps_ns, ip_indices, ip_is_suspicious
+
+def _burst_loop(burst_start_ns, burst_duration_ns, time_draws, suspicious_draws, ip_draws,
+                num_typical, num_suspicious):
+    """Single-pass loop form of _burst_layout, compiled with numba when it is installed"""
+    n = len(time_draws)
+    timestamps_ns = np.empty(n, dtype=np.int64)
+    ip_indices = np.empty(n, dtype=np.int64)
+    ip_is_suspicious = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        timestamps_ns[i] = burst_start_ns[i] + np.int64(time_draws[i] * burst_duration_ns[i])
+        ip_is_suspicious[i] = suspicious_draws[i] < 0.6
+        pool_size = num_suspicious if ip_is_suspicious[i] else num_typical[i]
+        ip_indices[i] = np.int64(ip_draws[i] * pool_size)
+    return timestamps_ns, ip_indices, ip_is_suspicious
+
+_burst_kernel = njit(cache=True)(_burst_loop) if njit is not None else _burst_layout
 
 class SeparateTenantDatasetGenerator:
-    def __init__(self):
+    def __init__(self, seed=42):
         self.days_back = 30
         
+        # Single PCG64 generator for all sampling (reproducible for a given seed)
+        self.reseed(seed)
+        
         # Define tenant-specific configurations
         self.tenant_configs = {
             'food': {
@@ -69,281 +112,281 @@ class SeparateTenantDatasetGenerator:
             'guest': 0.05       # 5% guest users
         }
         
+        # Sampling tables (keys + normalized CDF) built once instead of per np.random.choice call
+        self._role_keys, self._role_cdf = self._build_sampling_table(self.user_roles)
+        self._et_keys = {}
+        self._et_cdf = {}
+        for tenant_key, config in self.tenant_configs.items():
+            self._et_keys[tenant_key], self._et_cdf[tenant_key] = self._build_sampling_table(config['event_types'])
+        
         # IP address pools for different scenarios
+        self._build_ip_pools()
+        
+    def reseed(self, seed):
+        """Reset the sampling state from an int seed or a np.random.SeedSequence"""
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        self.rng = np.random.default_rng(seed)
+    
+    @staticmethod
+    def _build_sampling_table(weights):
+        """Return (keys, cdf) arrays for sampling from a {key: probability} mapping"""
+        keys = np.array(list(weights.keys()))
+        cdf = np.cumsum(list(weights.values()))
+        return keys, cdf / cdf[-1]
+    
+    @staticmethod
+    def _sample_codes(cdf, size, rng):
+        """Draw size key indices by inverting the CDF with searchsorted"""
+        return np.searchsorted(cdf, rng.random(size), side='right')
+    
+    @classmethod
+    def _sample(cls, keys, cdf, size, rng):
+        """Draw size keys by inverting the CDF with searchsorted"""
+        return keys[cls._sample_codes(cdf, size, rng)]
+    
+    @staticmethod
+    def _pick(pool, size, rng):
+        """Draw size values uniformly (with replacement) from a pool array with one gather"""
+        return pool[rng.integers(0, len(pool), size)]
+    
+    def _build_ip_pools(self):
+        """(Re)build the corporate, home and suspicious IP pools from self.rng"""
         self.corporate_ips = self._generate_corporate_ips()
         self.home_ips = self._generate_home_ips()
         self.suspicious_ips = self._generate_suspicious_ips()
-        
+    
     def _generate_corporate_ips(self):
         """Generate corporate IP ranges (typically 10.x.x.x, 192.168.x.x)"""
-        corporate_ips = []
         # Corporate network ranges
-        for _ in range(20):
-            corporate_ips.append(f"10.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}")
-        for _ in range(15):
-            corporate_ips.append(f"192.168.{random.randint(1, 254)}.{random.randint(1, 254)}")
-        return corporate_ips
+        ten_net = self.rng.integers(1, 255, (20, 4))
+        ten_net[:, 0] = 10
+        home_net = self.rng.integers(1, 255, (15, 4))
+        home_net[:, :2] = [192, 168]
+        return pack_ipv4(np.vstack([ten_net, home_net]))
     
     def _generate_home_ips(self):
         """Generate home/remote IP addresses"""
-        home_ips = []
-        for _ in range(100):
-            # Generate realistic public IP ranges
-            first_octet = random.choice([24, 50, 73, 98, 173, 184, 208])
-            home_ips.append(f"{first_octet}.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}")
-        return home_ips
+        octets = self.rng.integers(1, 255, (100, 4))
+        # Generate realistic public IP ranges
+        octets[:, 0] = self.rng.choice([24, 50, 73, 98, 173, 184, 208], 100)
+        return pack_ipv4(octets)
     
     def _generate_suspicious_ips(self):
         """Generate suspicious IP addresses from various countries"""
-        suspicious_ips = []
         # Known suspicious ranges and international IPs
         suspicious_ranges = [
-            "185.220.", "198.98.", "176.10.", "91.219.", "5.188.",
-            "46.166.", "194.147.", "89.248.", "178.128.", "159.89."
+            (185, 220), (198, 98), (176, 10), (91, 219), (5, 188),
+            (46, 166), (194, 147), (89, 248), (178, 128), (159, 89)
         ]
-        for base in suspicious_ranges:
-            for _ in range(5):
-                suspicious_ips.append(f"{base}{random.randint(1, 254)}.{random.randint(1, 254)}")
-        return suspicious_ips
+        octets = self.rng.integers(1, 255, (len(suspicious_ranges) * 5, 4))
+        octets[:, :2] = np.repeat(suspicious_ranges, 5, axis=0)
+        return pack_ipv4(octets)
     
     def _create_users(self, tenant_key):
-        """Create users for a specific tenant"""
+        """Create users for a specific tenant as column arrays.
+        
+        Typical IPs are stored CSR style: user u owns ip_flat[ip_offsets[u]:ip_offsets[u + 1]].
+        """
         config = self.tenant_configs[tenant_key]
-        users_data = {}
         num_users = config['users']
         tenant_id = config['tenant_id']
         
         print(f"Creating {num_users} users for {config['name']} (Tenant {tenant_id})")
         
-        for user_id in range(1, num_users + 1):
-            global_user_id = f"T{tenant_id:02d}U{user_id:03d}"
-            
-            # Assign role with realistic distribution
-            role = np.random.choice(
-                list(self.user_roles.keys()),
-                p=list(self.user_roles.values())
-            )
-            
-            # Assign typical IP addresses (80% corporate, 20% home)
-            typical_ips = []
-            if random.random() < 0.8:  # Corporate user
-                typical_ips = random.sample(self.corporate_ips, min(3, len(self.corporate_ips)))
-            else:  # Remote user
-                typical_ips = random.sample(self.home_ips, min(2, len(self.home_ips)))
-            
-            users_data[global_user_id] = {
-                'role': role,
-                'typical_ips': typical_ips,
-                'tenant_id': tenant_id,
-                'local_user_id': user_id,
-                'tenant_name': config['name']
-            }
-        
-        return users_data
+        # Assign roles with realistic distribution (codes into self._role_keys)
+        role_codes = self._sample_codes(self._role_cdf, num_users, self.rng).astype(np.int8)
+        
+        # Assign typical IP addresses (80% corporate with 3 IPs, 20% home with 2)
+        corporate = self.rng.random(num_users) < 0.8
+        ip_counts = np.where(corporate, min(3, len(self.corporate_ips)), min(2, len(self.home_ips)))
+        ip_offsets = np.concatenate(([0], np.cumsum(ip_counts)))
+        ip_flat = np.empty(ip_offsets[-1], dtype=np.uint32)
+        for user in range(num_users):
+            pool = self.corporate_ips if corporate[user] else self.home_ips
+            ip_flat[ip_offsets[user]:ip_offsets[user + 1]] = self.rng.choice(pool, ip_counts[user], replace=False)
+        
+        return {
+            'user_ids': np.array([f"T{tenant_id:02d}U{user_id:03d}" for user_id in range(1, num_users + 1)]),
+            'role_codes': role_codes,
+            'tenant_id': tenant_id,
+            'tenant_name': config['name'],
+            'ip_offsets': ip_offsets,
+            'ip_flat': ip_flat
+        }
+    
+    @staticmethod
+    def _allocate_logs(size):
+        """Preallocate empty column arrays for up to size events"""
+        return {
+            'timestamp': np.empty(size, dtype='datetime64[s]'),
+            'tenant_id': np.empty(size, dtype=np.int8),
+            'user_id': np.empty(size, dtype=object),
+            'event_type': np.empty(size, dtype=object),
+            'resource_id': np.empty(size, dtype=np.uint16),
+            'status': np.empty(size, dtype=object),
+            'ip_address': np.empty(size, dtype=np.uint32)
+        }
+    
+    @staticmethod
+    def _max_anomaly_events(num_users):
+        """Upper bound on injected events, from the per-injector user counts and event ranges"""
+        return (
+            min(8, num_users) * 36                    # failed login bursts
+            + max(5, int(num_users * 0.3)) * 12       # off-hours activity
+            + max(3, int(num_users * 0.1)) * 15       # complaints / admin actions
+            + max(3, int(num_users * 0.2)) * 8        # suspicious IP access
+        )
+    
+    @staticmethod
+    def _write_events(logs, start, timestamps, tenant_id, user_id, event_type, resource_id, status, ip_address):
+        """Write a batch of events into the preallocated logs at start (scalars are broadcast); return the next index"""
+        timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+        end = start + len(timestamps)
+        logs['timestamp'][start:end] = timestamps
+        values = (tenant_id, user_id, event_type, resource_id, status, ip_address)
+        for column, value in zip(LOG_COLUMNS[1:], values):
+            logs[column][start:end] = value
+        return end
+    
+    @staticmethod
+    def _days_before(now, days_ago):
+        """Timestamps a (fractional) number of days before now, in datetime64[ns]"""
+        return now - (np.asarray(days_ago) * 86_400e9).astype('timedelta64[ns]')
     
-    def _generate_normal_events(self, user_id, user_info, num_events, tenant_config):
-        """Generate normal user activity events"""
-        events = []
-        typical_ips = user_info['typical_ips']
-        tenant_events = tenant_config['event_types']
-        
-        for _ in range(num_events):
-            # Generate timestamp within the last 30 days
-            days_ago = random.uniform(0, self.days_back)
-            timestamp = datetime.now() - timedelta(days=days_ago)
-            
-            # Add realistic time patterns (more activity during business hours)
-            if random.random() < 0.8:  # 80% during business hours (9 AM - 6 PM)
-                business_hour = random.randint(9, 17)
-                timestamp = timestamp.replace(hour=business_hour, minute=random.randint(0, 59))
-            else:  # 20% outside business hours
-                off_hour = random.choice([7, 8, 18, 19, 20, 21, 22])
-                timestamp = timestamp.replace(hour=off_hour, minute=random.randint(0, 59))
-            
+    def _generate_normal_events(self, logs, start, users, user, num_events, tenant_config, now, rng):
+        """Write normal activity of users['user_ids'][user] at logs[start:start + num_events] in one batch drawn from rng"""
+        typical_ips = users['ip_flat'][users['ip_offsets'][user]:users['ip_offsets'][user + 1]]
+        tenant_key = 'food' if tenant_config['tenant_id'] == 1 else 'it'
+        
+        # Generate timestamps within the last 30 days
+        timestamps = self._days_before(now, rng.uniform(0, self.days_back, num_events))
+        
+        # Add realistic time patterns (80% during business hours 9 AM - 6 PM, 20% outside)
+        business = rng.random(num_events) < 0.8
+        hours = np.where(
+            business,
+            rng.integers(9, 18, num_events),
+            rng.choice([7, 8, 18, 19, 20, 21, 22], num_events)
+        )
+        timestamps = at_time_of_day(timestamps, hours, rng.integers(0, 60, num_events))
+        
+        return self._write_events(
+            logs,
+            start,
+            timestamps,
+            users['tenant_id'],
+            users['user_ids'][user],
             # Choose event type based on tenant
-            event_type = np.random.choice(
-                list(tenant_events.keys()),
-                p=list(tenant_events.values())
-            )
-            
+            self._sample(self._et_keys[tenant_key], self._et_cdf[tenant_key], num_events, rng),
             # Generate resource ID (RES_1 to RES_1000 as requested)
-            resource_id = f"RES_{random.randint(1, 1000)}"
-            
+            rng.integers(1, NUM_RESOURCES + 1, num_events, dtype=np.uint16),
             # Status (90% success for normal events, 10% failure as requested)
-            status = 'SUCCESS' if random.random() < 0.90 else 'FAILURE'
-            
+            np.where(rng.random(num_events) < 0.90, 'SUCCESS', 'FAILURE'),
             # IP address (mostly from typical IPs)
-            ip_address = random.choice(typical_ips) if typical_ips else random.choice(self.corporate_ips)
-            
-            events.append({
-                'timestamp': timestamp,
-                'tenant_id': user_info['tenant_id'],
-                'user_id': user_id,
-                'event_type': event_type,
-                'resource_id': resource_id,
-                'status': status,
-                'ip_address': ip_address
-            })
-        
-        return events
+            self._pick(typical_ips, num_events, rng)
+        )
     
-    def _inject_failed_login_bursts(self, users_data, logs):
-        """Inject bursts of failed login attempts (brute force simulation)"""
-        print("  → Injecting failed login burst anomalies...")
-        
-        # Select 8 users for failed login bursts as specified
-        all_users = list(users_data.items())
-        num_anomaly_users = min(8, len(all_users))
-        anomaly_users = random.sample(all_users, num_anomaly_users)
-        
-        for user_id, user_info in anomaly_users:
-            # Generate burst of failed logins
-            burst_start = datetime.now() - timedelta(days=random.uniform(1, 25))
-            burst_duration = timedelta(minutes=random.randint(10, 120))
-            
-            # 10-36 failed login attempts as specified
-            num_attempts = random.randint(10, 36)
-            
-            for i in range(num_attempts):
-                timestamp = burst_start + timedelta(
-                    seconds=random.uniform(0, burst_duration.total_seconds())
-                )
-                
-                # Mix of suspicious and normal IPs during attack
-                if random.random() < 0.6:  # 60% from suspicious IPs
-                    ip_address = random.choice(self.suspicious_ips)
-                else:
-                    ip_address = random.choice(user_info['typical_ips']) if user_info['typical_ips'] else random.choice(self.corporate_ips)
-                
-                logs.append({
-                    'timestamp': timestamp,
-                    'tenant_id': user_info['tenant_id'],
-                    'user_id': user_id,
-                    'event_type': 'LOGIN',
-                    'resource_id': f"RES_{random.randint(1, 1000)}",
-                    'status': 'FAILURE',
-                    'ip_address': ip_address
-                })
+    def _anomaly_owners(self, candidates, num_anomaly_users, min_events, max_events):
+        """Pick distinct users from candidate indices and repeat each once per anomalous event"""
+        chosen = self.rng.choice(candidates, num_anomaly_users, replace=False)
+        return np.repeat(chosen, self.rng.integers(min_events, max_events + 1, num_anomaly_users))
     
-    def _inject_off_hours_activity(self, users_data, logs, tenant_config):
-        """Inject off-hours activity (11 PM - 5 AM)"""
-        print("  → Injecting off-hours activity anomalies...")
+    def _inject_all_anomalies(self, users, logs, start, tenant_key, now):
+        """Inject every anomaly class in one pass over the users, one vectorized block per class"""
+        config = self.tenant_configs[tenant_key]
+        tenant_id = config['tenant_id']
+        event_types = self._et_keys[tenant_key]
         
-        # Select 30% of users for off-hours activity
-        all_users = list(users_data.items())
-        num_anomaly_users = max(5, int(len(all_users) * 0.3))
-        anomaly_users = random.sample(all_users, num_anomaly_users)
-        
-        for user_id, user_info in anomaly_users:
-            # Generate 5-12 off-hours events (targeting ~10% of total events)
-            num_events = random.randint(5, 12)
-            
-            for _ in range(num_events):
-                timestamp = datetime.now() - timedelta(days=random.uniform(1, 20))
-                
-                # Set to off hours (11 PM - 5 AM)
-                off_hour = random.choice([23, 0, 1, 2, 3, 4, 5])
-                timestamp = timestamp.replace(hour=off_hour, minute=random.randint(0, 59))
-                
-                # Choose appropriate event type based on tenant
-                event_types = list(tenant_config['event_types'].keys())
-                event_type = random.choice(event_types)
-                
-                logs.append({
-                    'timestamp': timestamp,
-                    'tenant_id': user_info['tenant_id'],
-                    'user_id': user_id,
-                    'event_type': event_type,
-                    'resource_id': f"RES_{random.randint(1, 1000)}",
-                    'status': 'SUCCESS',
-                    'ip_address': random.choice(user_info['typical_ips']) if user_info['typical_ips'] else random.choice(self.corporate_ips)
-                })
-    
-    def _inject_tenant_specific_anomalies(self, users_data, logs, tenant_key):
-        """Inject tenant-specific anomalies"""
+        user_ids = users['user_ids']
+        ip_flat = users['ip_flat']
+        ip_offsets = users['ip_offsets'][:-1]
+        ip_counts = np.diff(users['ip_offsets'])
+        all_users = np.arange(len(user_ids))
+        
+        def typical_ip_draws(owners):
+            slots = (self.rng.random(len(owners)) * ip_counts[owners]).astype(np.int64)
+            return ip_flat[ip_offsets[owners] + slots]
+        
+        def resource_ids(n):
+            return self.rng.integers(1, NUM_RESOURCES + 1, n, dtype=np.uint16)
+        
+        # Bursts of failed logins (brute force simulation): 8 users, 10-36 attempts
+        # over a 10-120 minute window, 60% of them from suspicious IPs
+        print("  → Injecting failed login burst anomalies...")
+        num_bursts = min(8, len(user_ids))
+        burst_users = self.rng.choice(all_users, num_bursts, replace=False)
+        attempts = self.rng.integers(10, 37, num_bursts)
+        burst_starts = self._days_before(now, self.rng.uniform(1, 25, num_bursts)).view(np.int64)
+        burst_durations = self.rng.integers(10, 121, num_bursts) * 60 * 10**9
+        owners = np.repeat(burst_users, attempts)
+        time_draws, suspicious_draws, ip_draws = self.rng.random((3, len(owners)))
+        timestamps_ns, ip_indices, ip_is_suspicious = _burst_kernel(
+            np.repeat(burst_starts, attempts), np.repeat(burst_durations, attempts),
+            time_draws, suspicious_draws, ip_draws,
+            ip_counts[owners], len(self.suspicious_ips)
+        )
+        ip_addresses = np.where(
+            ip_is_suspicious,
+            self.suspicious_ips[np.where(ip_is_suspicious, ip_indices, 0)],
+            ip_flat[ip_offsets[owners] + np.where(ip_is_suspicious, 0, ip_indices)]
+        )
+        start = self._write_events(
+            logs, start, timestamps_ns.astype('datetime64[ns]'), tenant_id, user_ids[owners],
+            'LOGIN', resource_ids(len(owners)), 'FAILURE', ip_addresses
+        )
+        
+        # Off-hours activity (11 PM - 5 AM): 30% of users, 5-12 events each
+        print("  → Injecting off-hours activity anomalies...")
+        owners = self._anomaly_owners(all_users, max(5, int(len(user_ids) * 0.3)), 5, 12)
+        n = len(owners)
+        timestamps = at_time_of_day(
+            self._days_before(now, self.rng.uniform(1, 20, n)),
+            self.rng.choice([23, 0, 1, 2, 3, 4, 5], n),
+            self.rng.integers(0, 60, n)
+        )
+        start = self._write_events(
+            logs, start, timestamps, tenant_id, user_ids[owners],
+            self._pick(event_types, n, self.rng), resource_ids(n), 'SUCCESS', typical_ip_draws(owners)
+        )
+        
+        # Tenant-specific anomalies
         if tenant_key == 'food':
+            # Excessive complaints: 10% of users, 8-15 complaints each
             print("  → Injecting excessive complaint anomalies...")
-            # Select users for excessive complaints
-            all_users = list(users_data.items())
-            num_anomaly_users = max(3, int(len(all_users) * 0.1))
-            anomaly_users = random.sample(all_users, num_anomaly_users)
-            
-            for user_id, user_info in anomaly_users:
-                # Generate excessive complaints
-                num_complaints = random.randint(8, 15)
-                
-                for _ in range(num_complaints):
-                    timestamp = datetime.now() - timedelta(days=random.uniform(1, 28))
-                    
-                    logs.append({
-                        'timestamp': timestamp,
-                        'tenant_id': user_info['tenant_id'],
-                        'user_id': user_id,
-                        'event_type': 'COMPLAINT',
-                        'resource_id': f"RES_{random.randint(1, 1000)}",
-                        'status': 'SUCCESS',
-                        'ip_address': random.choice(user_info['typical_ips']) if user_info['typical_ips'] else random.choice(self.corporate_ips)
-                    })
-        
+            owners = self._anomaly_owners(all_users, max(3, int(len(user_ids) * 0.1)), 8, 15)
+            event_type = 'COMPLAINT'
         elif tenant_key == 'it':
+            # Unauthorized admin actions: 10% of non-admin users, 2-4 actions each
             print("  → Injecting unauthorized admin action anomalies...")
-            # Select non-admin users for unauthorized admin actions
-            non_admin_users = [(user_id, user_info) for user_id, user_info in users_data.items() 
-                              if user_info['role'] != 'admin']
-            
-            if non_admin_users:
-                num_anomaly_users = max(2, int(len(non_admin_users) * 0.1))
-                anomaly_users = random.sample(non_admin_users, num_anomaly_users)
-                
-                for user_id, user_info in anomaly_users:
-                    # Generate 2-4 unauthorized admin actions
-                    num_actions = random.randint(2, 4)
-                    
-                    for _ in range(num_actions):
-                        timestamp = datetime.now() - timedelta(days=random.uniform(1, 28))
-                        
-                        logs.append({
-                            'timestamp': timestamp,
-                            'tenant_id': user_info['tenant_id'],
-                            'user_id': user_id,
-                            'event_type': 'ADMIN_ACTION',
-                            'resource_id': f"RES_{random.randint(1, 1000)}",
-                            'status': 'SUCCESS',
-                            'ip_address': random.choice(user_info['typical_ips']) if user_info['typical_ips'] else random.choice(self.corporate_ips)
-                        })
-    
-    def _inject_suspicious_ip_access(self, users_data, logs):
-        """Inject access from suspicious IP addresses"""
+            non_admin_users = np.flatnonzero(self._role_keys[users['role_codes']] != 'admin')
+            if len(non_admin_users):
+                owners = self._anomaly_owners(non_admin_users, max(2, int(len(non_admin_users) * 0.1)), 2, 4)
+            else:
+                owners = non_admin_users
+            event_type = 'ADMIN_ACTION'
+        else:
+            owners = np.array([], dtype=np.int64)
+            event_type = None
+        n = len(owners)
+        start = self._write_events(
+            logs, start, self._days_before(now, self.rng.uniform(1, 28, n)), tenant_id, user_ids[owners],
+            event_type, resource_ids(n), 'SUCCESS', typical_ip_draws(owners)
+        )
+        
+        # Access from suspicious IPs: 20% of users, 3-8 events each, 40% failing
         print("  → Injecting suspicious IP access anomalies...")
-        
-        # Select 20% of users for suspicious IP access
-        all_users = list(users_data.items())
-        num_anomaly_users = max(3, int(len(all_users) * 0.2))
-        anomaly_users = random.sample(all_users, num_anomaly_users)
-        
-        for user_id, user_info in anomaly_users:
-            # Generate 3-8 events from suspicious IPs
-            num_events = random.randint(3, 8)
-            
-            for _ in range(num_events):
-                timestamp = datetime.now() - timedelta(days=random.uniform(1, 25))
-                
-                # Random event type from tenant's available types
-                tenant_config = self.tenant_configs['food'] if user_info['tenant_id'] == 1 else self.tenant_configs['it']
-                event_type = random.choice(list(tenant_config['event_types'].keys()))
-                
-                # Higher failure rate for suspicious IPs
-                status = 'FAILURE' if random.random() < 0.4 else 'SUCCESS'
-                
-                logs.append({
-                    'timestamp': timestamp,
-                    'tenant_id': user_info['tenant_id'],
-                    'user_id': user_id,
-                    'event_type': event_type,
-                    'resource_id': f"RES_{random.randint(1, 1000)}",
-                    'status': status,
-                    'ip_address': random.choice(self.suspicious_ips)
-                })
+        owners = self._anomaly_owners(all_users, max(3, int(len(user_ids) * 0.2)), 3, 8)
+        n = len(owners)
+        start = self._write_events(
+            logs, start, self._days_before(now, self.rng.uniform(1, 25, n)), tenant_id, user_ids[owners],
+            self._pick(event_types, n, self.rng), resource_ids(n),
+            np.where(self.rng.random(n) < 0.4, 'FAILURE', 'SUCCESS'),
+            self._pick(self.suspicious_ips, n, self.rng)
+        )
+        
+        return start
     
     def generate_tenant_dataset(self, tenant_key):
         """Generate dataset for a specific tenant"""
@@ -352,57 +395,83 @@ class SeparateTenantDatasetGenerator:
         print("=" * 50)
         
         # Step 1: Create users
-        users_data = self._create_users(tenant_key)
+        users = self._create_users(tenant_key)
+        
+        # One clock read per run; every timestamp is computed from it in datetime64[ns]
+        now = np.datetime64(datetime.now(), 'ns')
         
         # Step 2: Generate normal events
         print(f"Generating normal events for {config['users']} users...")
-        logs = []
+        # Users are generated on a thread pool (NumPy releases the GIL in the bulk draws);
+        # each user gets an independent Generator spawned from the seed sequence, so the
+        # output does not depend on thread scheduling and no RNG state is shared
+        num_users = len(users['user_ids'])
+        user_seeds = self.seed_sequence.spawn(num_users)
+        
+        # Every user owns a fixed slice of the preallocated columns, so threads never overlap
+        events_per_user = config['events_per_user']
+        total_normal = num_users * events_per_user
+        logs = self._allocate_logs(total_normal + self._max_anomaly_events(num_users))
         
-        for user_id, user_info in users_data.items():
-            normal_events = self._generate_normal_events(user_id, user_info, config['events_per_user'], config)
-            logs.extend(normal_events)
+        def generate_user(item):
+            user, seed = item
+            rng = np.random.default_rng(seed)
+            self._generate_normal_events(logs, user * events_per_user, users, user, events_per_user, config, now, rng)
         
-        print(f"Generated {len(logs)} normal events")
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(generate_user, enumerate(user_seeds)))
+        
+        print(f"Generated {total_normal} normal events")
         
         # Step 3: Inject anomalies
         print("\n🔍 Injecting realistic anomalies...")
-        initial_count = len(logs)
-        
-        self._inject_failed_login_bursts(users_data, logs)
-        self._inject_off_hours_activity(users_data, logs, config)
-        self._inject_tenant_specific_anomalies(users_data, logs, tenant_key)
-        self._inject_suspicious_ip_access(users_data, logs)
+        end = self._inject_all_anomalies(users, logs, total_normal, tenant_key, now)
         
-        anomaly_count = len(logs) - initial_count
-        print(f"Injected {anomaly_count} anomalous events")
+        print(f"Injected {end - total_normal} anomalous events")
         
-        # Step 4: Sort logs by timestamp
+        # Step 4: Sort logs by timestamp (stable, so same-second events keep generation order)
         print("Sorting logs by timestamp...")
-        logs.sort(key=lambda x: x['timestamp'])
+        order = np.argsort(logs['timestamp'][:end], kind='stable')
+        logs = {column: values[order] for column, values in logs.items()}
         
-        print(f"✅ Total events generated: {len(logs)}")
+        print(f"✅ Total events generated: {len(logs['timestamp'])}")
         
-        return logs, users_data
+        return logs, users
     
-    def save_to_csv(self, logs, filename):
-        """Save logs to CSV file"""
+    def save_to_csv(self, logs, filename, chunksize=50_000):
+        """Save logs to CSV file, streaming chunksize rows at a time"""
         print(f"\n💾 Saving logs to {filename}...")
         
-        # Convert to DataFrame
-        df = pd.DataFrame(logs)
-        
-        # Format timestamp
-        df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Reorder columns as specified
-        column_order = ['timestamp', 'tenant_id', 'user_id', 'event_type', 'resource_id', 'status', 'ip_address']
-        df = df[column_order]
-        
-        # Save to CSV
-        df.to_csv(filename, index=False)
+        # Convert to DataFrame in the specified column order (IPs and resource ids are held as integers until now)
+        df = pd.DataFrame({column: logs[column] for column in LOG_COLUMNS}, copy=False)
+        df['ip_address'] = format_ipv4(logs['ip_address'])
+        df['resource_id'] = pd.Categorical.from_codes(
+            logs['resource_id'].astype(np.int16) - 1,
+            categories=[f"RES_{i}" for i in range(1, NUM_RESOURCES + 1)]
+        )
+        
+        # Low-cardinality columns are written and summarized from category codes
+        for column in ('event_type', 'status'):
+            df[column] = df[column].astype('category')
+        
+        # Save to CSV with Arrow's vectorized writer (timestamp[s] is written as YYYY-MM-DD HH:MM:SS);
+        # only one chunk is converted to Arrow at a time, so the extra memory stays bounded
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        write_options = pacsv.WriteOptions(quoting_style='none', quoting_header='none')
+        with pacsv.CSVWriter(filename, schema, write_options=write_options) as writer:
+            for offset in range(0, len(df), chunksize):
+                chunk = df.iloc[offset:offset + chunksize]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
         
         print(f"✅ Successfully saved {len(df)} events to {filename}")
         
+        # Parquet copy for ML consumers and the analysis scripts (written after the CSV, so it is fresh)
+        parquet_file = parquet_path(filename)
+        df.astype({column: 'category' for column in CATEGORICAL_COLUMNS}).to_parquet(
+            parquet_file, engine='pyarrow', compression='snappy', index=False
+        )
+        print(f"✅ Parquet copy saved to {parquet_file}")
+        
         # Print summary statistics
         print(f"\n📊 {filename} Summary:")
         print("-" * 40)
@@ -425,27 +494,48 @@ class SeparateTenantDatasetGenerator:
         print("🎯 VaultSphere Separate Tenant Dataset Generator")
         print("=" * 60)
         
-        datasets = {}
-        
-        # Generate Food Company dataset
-        food_logs, food_users = self.generate_tenant_dataset('food')
-        food_df = self.save_to_csv(food_logs, self.tenant_configs['food']['filename'])
-        datasets['food'] = {'logs': food_logs, 'users': food_users, 'df': food_df}
+        # Generate the Food Company and IT Solutions datasets in parallel;
+        # each worker's output is replayed in order once both finish
+        tenant_keys = ['food', 'it']
+        tenant_seeds = self.seed_sequence.spawn(len(tenant_keys))
+        with mp.Pool(len(tenant_keys)) as pool:
+            results = pool.starmap(
+                _generate_tenant_worker,
+                [(self, tenant_key, seed) for tenant_key, seed in zip(tenant_keys, tenant_seeds)]
+            )
         
-        # Generate IT Solutions dataset
-        it_logs, it_users = self.generate_tenant_dataset('it')
-        it_df = self.save_to_csv(it_logs, self.tenant_configs['it']['filename'])
-        datasets['it'] = {'logs': it_logs, 'users': it_users, 'df': it_df}
+        datasets = {}
+        for tenant_key, (output, dataset) in zip(tenant_keys, results):
+            print(output, end='')
+            datasets[tenant_key] = dataset
+        food_df = datasets['food']['df']
+        it_df = datasets['it']['df']
         
         # Print overall summary
         print(f"\n🎉 GENERATION COMPLETE!")
         print("=" * 60)
-        print(f"Food Company Dataset: {len(food_logs):,} events → {self.tenant_configs['food']['filename']}")
-        print(f"IT Solutions Dataset: {len(it_logs):,} events → {self.tenant_configs['it']['filename']}")
-        print(f"Total Events: {len(food_logs) + len(it_logs):,}")
+        print(f"Food Company Dataset: {len(food_df):,} events → {self.tenant_configs['food']['filename']}")
+        print(f"IT Solutions Dataset: {len(it_df):,} events → {self.tenant_configs['it']['filename']}")
+        print(f"Total Events: {len(food_df) + len(it_df):,}")
         
         return datasets
 
+def _generate_tenant_worker(generator, tenant_key, seed_sequence):
+    """Generate and save one tenant's dataset in a worker process, returning (output, dataset)"""
+    # The worker runs on a pickled copy of the parent generator, so both tenants keep the
+    # parent's configuration and shared IP pools; only the event stream is reseeded, from
+    # the child seed sequence spawned off the parent's
+    config = generator.tenant_configs[tenant_key]
+    
+    generator.reseed(seed_sequence)
+    
+    output = io.StringIO()
+    with redirect_stdout(output):
+        logs, users = generator.generate_tenant_dataset(tenant_key)
+        df = generator.save_to_csv(logs, config['filename'])
+    
+    return output.getvalue(), {'logs': logs, 'users': users, 'df': df}
+
 def main():
     """Main execution function"""
     generator = SeparateTenantDatasetGenerator()
@@ -455,6 +545,7 @@ def main():
     print("Files created:")
     print("  • vaultsphere_food.csv - Food Company dataset")
     print("  • vaultsphere_it.csv - IT Solutions dataset")
+    print("  • vaultsphere_food.parquet / vaultsphere_it.parquet - Parquet copies")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -9,22 +9,70 @@ Date: 2025-09-25
 
 import pandas as pd
 import numpy as np
-from faker import Faker
-import random
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from datetime import datetime
 import ipaddress
 import os
+import io
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from log_utils import at_time_of_day, format_ipv4, pack_ipv4
 
-# Initialize Faker for generating realistic data
-fake = Faker()
-Faker.seed(42)  # For reproducible results
-random.seed(42)
-np.random.seed(42)
+# Output column order of the generated CSV
+LOG_COLUMNS = ['timestamp', 'tenant_id', 'user_id', 'event_type', 'resource_id', 'status', 'ip_address']
+
+# event_type and status are carried as integer codes into these categories
+# (status is a uint8 failure flag: 0 = SUCCESS, 1 = FAILURE)
+EVENT_TYPES = ['LOGIN', 'ORDER', 'PAYMENT', 'UPDATE', 'COMPLAINT', 'UPLOAD', 'DOWNLOAD', 'ADMIN_ACTION', 'CREATE']
+STATUSES = ['SUCCESS', 'FAILURE']
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+CODE_DTYPES = {'event_type': np.int8, 'status': np.uint8}
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+def event_codes(names):
+    """Map event type names to their int8 codes"""
+    return np.array([EVENT_CODES[name] for name in names], dtype=np.int8)
+
+def build_alias_table(probs):
+    """Build a Walker/Vose alias table (acceptance probabilities, aliases) for a discrete distribution"""
+    probs = np.asarray(probs, dtype=float)
+    n = len(probs)
+    scaled = probs / probs.sum() * n
+    accept = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1]
+    large = [i for i in range(n) if scaled[i] >= 1]
+    while small and large:
+        low, high = small.pop(), large.pop()
+        accept[low] = scaled[low]
+        alias[low] = high
+        scaled[high] += scaled[low] - 1
+        (large if scaled[high] >= 1 else small).append(high)
+    return accept, alias
+
+def alias_sample(accept, alias, size, rng):
+    """Draw size category indices from an alias table in O(1) per draw"""
+    columns = rng.integers(0, len(accept), size)
+    return np.where(rng.random(size) < accept[columns], columns, alias[columns])
+
+# Fixed choice sets used by the injectors, built once
+UNUSUAL_IP_EVENT_CODES = event_codes(['LOGIN', 'CREATE', 'UPDATE', 'DOWNLOAD'])
+FOOD_OFF_HOURS_EVENT_CODES = event_codes(['ORDER', 'PAYMENT', 'UPDATE'])
+IT_OFF_HOURS_EVENT_CODES = event_codes(['UPLOAD', 'DOWNLOAD', 'UPDATE', 'ADMIN_ACTION'])
+OFF_HOURS = np.array([23, 0, 1, 2, 3, 4, 5])
 
 class VaultSphereLogGenerator:
     def __init__(self):
         self.days_back = 30
         
+        # Seeded PCG64 generator; the seed sequence also spawns one seed per worker task
+        self.seed_sequence = np.random.SeedSequence(42)
+        self.rng = np.random.default_rng(self.seed_sequence)
+        
         # Define tenant-specific configurations
         self.tenant_configs = {
             1: {
@@ -67,46 +115,45 @@ class VaultSphereLogGenerator:
             'guest': 0.05       # 5% guest users
         }
         
-        # IP address pools for different scenarios
+        # IP address pools for different scenarios (packed uint32 addresses)
         self.corporate_ips = self._generate_corporate_ips()
         self.home_ips = self._generate_home_ips()
         self.suspicious_ips = self._generate_suspicious_ips()
         
-        # Initialize data structures
+        # Per-tenant event type codes and alias tables for sampling
+        self._tenant_event_codes = {}
+        self._tenant_event_alias = {}
+        for tenant_id, config in self.tenant_configs.items():
+            self._tenant_event_codes[tenant_id] = event_codes(config['event_types'].keys())
+            self._tenant_event_alias[tenant_id] = build_alias_table(list(config['event_types'].values()))
+        
+        # Initialize data structures (events accumulate as per-column lists of arrays)
         self.users_data = {}
-        self.logs = []
+        self.cols = {column: [] for column in LOG_COLUMNS}
+        self.logs = {}
         
     def _generate_corporate_ips(self):
         """Generate corporate IP ranges (typically 10.x.x.x, 192.168.x.x)"""
-        corporate_ips = []
         # Corporate network ranges
-        for _ in range(20):
-            corporate_ips.append(f"10.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}")
-        for _ in range(15):
-            corporate_ips.append(f"192.168.{random.randint(1, 254)}.{random.randint(1, 254)}")
-        return corporate_ips
+        ten_net = np.column_stack([np.full(20, 10), self.rng.integers(1, 255, size=(20, 3))])
+        private_net = np.column_stack([np.full(15, 192), np.full(15, 168), self.rng.integers(1, 255, size=(15, 2))])
+        return pack_ipv4(np.vstack([ten_net, private_net]))
     
     def _generate_home_ips(self):
         """Generate home/remote IP addresses"""
-        home_ips = []
-        for _ in range(100):
-            # Generate realistic public IP ranges
-            first_octet = random.choice([24, 50, 73, 98, 173, 184, 208])
-            home_ips.append(f"{first_octet}.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}")
-        return home_ips
+        # Generate realistic public IP ranges
+        first_octets = self.rng.choice([24, 50, 73, 98, 173, 184, 208], size=100)
+        return pack_ipv4(np.column_stack([first_octets, self.rng.integers(1, 255, size=(100, 3))]))
     
     def _generate_suspicious_ips(self):
         """Generate suspicious IP addresses from various countries"""
-        suspicious_ips = []
         # Known suspicious ranges and international IPs
-        suspicious_ranges = [
-            "185.220.", "198.98.", "176.10.", "91.219.", "5.188.",
-            "46.166.", "194.147.", "89.248.", "178.128.", "159.89."
-        ]
-        for base in suspicious_ranges:
-            for _ in range(5):
-                suspicious_ips.append(f"{base}{random.randint(1, 254)}.{random.randint(1, 254)}")
-        return suspicious_ips
+        suspicious_ranges = np.array([
+            (185, 220), (198, 98), (176, 10), (91, 219), (5, 188),
+            (46, 166), (194, 147), (89, 248), (178, 128), (159, 89)
+        ])
+        bases = np.repeat(suspicious_ranges, 5, axis=0)
+        return pack_ipv4(np.column_stack([bases, self.rng.integers(1, 255, size=(len(bases), 2))]))
     
     def _create_users(self):
         """Create users for all tenants with assigned roles and typical IPs"""
@@ -123,17 +170,16 @@ class VaultSphereLogGenerator:
                 global_user_id = f"T{tenant_id:02d}U{user_id:03d}"
                 
                 # Assign role with realistic distribution
-                role = np.random.choice(
+                role = self.rng.choice(
                     list(self.user_roles.keys()),
                     p=list(self.user_roles.values())
                 )
                 
                 # Assign typical IP addresses (80% corporate, 20% home)
-                typical_ips = []
-                if random.random() < 0.8:  # Corporate user
-                    typical_ips = random.sample(self.corporate_ips, min(3, len(self.corporate_ips)))
+                if self.rng.random() < 0.8:  # Corporate user
+                    typical_ips = self.rng.choice(self.corporate_ips, min(3, len(self.corporate_ips)), replace=False)
                 else:  # Remote user
-                    typical_ips = random.sample(self.home_ips, min(2, len(self.home_ips)))
+                    typical_ips = self.rng.choice(self.home_ips, min(2, len(self.home_ips)), replace=False)
                 
                 tenant_users[global_user_id] = {
                     'role': role,
@@ -146,95 +192,103 @@ class VaultSphereLogGenerator:
             self.users_data[tenant_id] = tenant_users
             total_users += num_users
         
+        # Flat per-user arrays shared by the injectors, indexed by dense user index. Typical IPs
+        # are padded to 3 columns by cycling, and draws are limited to each user's real count
+        user_infos = [user_info for tenant_users in self.users_data.values() for user_info in tenant_users.values()]
+        self._all_user_ids = np.array([user_id for tenant_users in self.users_data.values() for user_id in tenant_users])
+        self._user_index = {user_id: i for i, user_id in enumerate(self._all_user_ids)}
+        self._user_tenant_ids = np.array([user_info['tenant_id'] for user_info in user_infos])
+        self._typical_ip_pool = np.stack([np.resize(user_info['typical_ips'], 3) for user_info in user_infos]).astype(np.uint32)
+        self._typical_ip_counts = np.array([len(user_info['typical_ips']) for user_info in user_infos])
+        
         print(f"Created {total_users} users across {len(self.tenant_configs)} tenants")
     
-    def _generate_normal_events(self, user_id, user_info, num_events):
-        """Generate normal user activity events"""
-        events = []
-        tenant_id = user_info['tenant_id']
-        typical_ips = user_info['typical_ips']
-        
-        # Get tenant-specific event distribution
-        tenant_config = self.tenant_configs[tenant_id]
-        tenant_events = tenant_config['event_types']
-        
-        for _ in range(num_events):
-            # Generate timestamp within the last 30 days
-            days_ago = random.uniform(0, self.days_back)
-            timestamp = datetime.now() - timedelta(days=days_ago)
-            
-            # Add some realistic time patterns (more activity during business hours)
-            if random.random() < 0.7:  # 70% during business hours
-                business_hour = random.randint(9, 17)
-                timestamp = timestamp.replace(hour=business_hour, minute=random.randint(0, 59))
-            
-            # Choose event type based on tenant
-            event_type = np.random.choice(
-                list(tenant_events.keys()),
-                p=list(tenant_events.values())
-            )
-            
-            # Generate resource ID (RES_1 to RES_1000 as requested)
-            resource_id = f"RES_{random.randint(1, 1000)}"
-            
-            # Status (90% success for normal events, 10% failure as requested)
-            status = 'SUCCESS' if random.random() < 0.90 else 'FAILURE'
-            
-            # IP address (mostly from typical IPs)
-            ip_address = random.choice(typical_ips) if typical_ips else random.choice(self.corporate_ips)
-            
-            events.append({
-                'timestamp': timestamp,
-                'tenant_id': tenant_id,
-                'user_id': user_id,
-                'event_type': event_type,
-                'resource_id': resource_id,
-                'status': status,
-                'ip_address': ip_address
-            })
-        
-        return events
+    def _append_events(self, timestamps, tenant_id, user_id, event_type, resource_id, status, ip_address):
+        """Append a batch of events to self.cols as column arrays (scalars are broadcast)"""
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        self.cols['timestamp'].append(timestamps)
+        values = (tenant_id, user_id, event_type, resource_id, status, ip_address)
+        for column, value in zip(LOG_COLUMNS[1:], values):
+            value = np.asarray(value, dtype=CODE_DTYPES.get(column))
+            self.cols[column].append(np.broadcast_to(value, timestamps.shape))
+    
+    def _generate_normal_events_batch(self, tenant_id, tenant_users, events_per_user):
+        """Generate normal activity for all of a tenant's users as one vectorized batch"""
+        counts = np.full(len(tenant_users), events_per_user)
+        num_events = counts.sum()
+        tenant_ids, user_ids, typical_ips = self._repeat_users(list(tenant_users), counts)
+        
+        # Generate timestamps within the last 30 days
+        timestamps = self._days_ago(0, self.days_back, num_events)
+        
+        # Add some realistic time patterns (70% moved into business hours, keeping their seconds)
+        business = self.rng.random(num_events) < 0.7
+        hours = self.rng.integers(9, 18, num_events)
+        minutes = self.rng.integers(0, 60, num_events)
+        timestamps = np.where(business, at_time_of_day(timestamps, hours, minutes), timestamps)
+        
+        # Tenant-specific event distribution (precomputed in __init__)
+        event_type_codes = self._tenant_event_codes[tenant_id]
+        accept, alias = self._tenant_event_alias[tenant_id]
+        
+        # Choose event type based on tenant
+        event_types = event_type_codes[alias_sample(accept, alias, num_events, self.rng)]
+        
+        # Status (90% success for normal events, 10% failure as requested)
+        statuses = (self.rng.random(num_events) >= 0.90).view(np.uint8)
+        
+        # Resource IDs RES_1 to RES_1000 as requested; IP addresses from each user's typical IPs
+        self._append_events(timestamps, tenant_ids, user_ids, event_types, self._random_resource_ids(num_events), statuses, typical_ips)
+    
+    def _extend_cols(self, cols):
+        """Add column arrays generated elsewhere (e.g. by a worker process) to self.cols"""
+        for column, batches in cols.items():
+            self.cols[column].extend(batches)
+    
+    def _repeat_users(self, chosen_ids, counts):
+        """Expand per-user tenant ids, user ids and typical-IP draws to one entry per event"""
+        user_index = np.repeat([self._user_index[user_id] for user_id in chosen_ids], counts)
+        
+        # Draw each event's IP from its own user's typical IPs with one gather from the padded pool
+        draws = (self.rng.random(len(user_index)) * self._typical_ip_counts[user_index]).astype(np.int64)
+        typical_ips = self._typical_ip_pool[user_index, draws]
+        return self._user_tenant_ids[user_index], self._all_user_ids[user_index], typical_ips
+    
+    def _random_resource_ids(self, size):
+        """Generate RES_1 to RES_1000 resource ids"""
+        return np.char.add('RES_', self.rng.integers(1, 1001, size).astype(str))
+    
+    def _days_ago(self, low, high, size):
+        """datetime64[ns] timestamps drawn uniformly between high and low days before the cached now"""
+        offsets_ns = (self.rng.uniform(low, high, size) * NS_PER_DAY).astype(np.int64)
+        return self._now - offsets_ns.astype('timedelta64[ns]')
     
     def _inject_failed_login_bursts(self):
         """Inject bursts of failed login attempts (brute force simulation)"""
         print("Injecting failed login burst anomalies...")
         
         # Select users from both tenants for failed login bursts
-        all_users = [(user_id, user_info) for tenant_users in self.users_data.values() 
-                     for user_id, user_info in tenant_users.items()]
-        
         # Select 5% of users for failed login bursts
-        num_anomaly_users = max(2, int(len(all_users) * 0.05))
-        anomaly_users = random.sample(all_users, num_anomaly_users)
-        
-        for user_id, user_info in anomaly_users:
-            # Generate burst of failed logins
-            burst_start = datetime.now() - timedelta(days=random.uniform(1, 25))
-            burst_duration = timedelta(minutes=random.randint(10, 120))  # 10 minutes to 2 hours
-            
-            # 10-30 failed login attempts
-            num_attempts = random.randint(10, 30)
-            
-            for i in range(num_attempts):
-                timestamp = burst_start + timedelta(
-                    seconds=random.uniform(0, burst_duration.total_seconds())
-                )
-                
-                # Mix of suspicious and normal IPs during attack
-                if random.random() < 0.6:  # 60% from suspicious IPs
-                    ip_address = random.choice(self.suspicious_ips)
-                else:
-                    ip_address = random.choice(user_info['typical_ips']) if user_info['typical_ips'] else random.choice(self.corporate_ips)
-                
-                self.logs.append({
-                    'timestamp': timestamp,
-                    'tenant_id': user_info['tenant_id'],
-                    'user_id': user_id,
-                    'event_type': 'LOGIN',
-                    'resource_id': f"RES_{random.randint(1, 1000)}",
-                    'status': 'FAILURE',
-                    'ip_address': ip_address
-                })
+        num_anomaly_users = max(2, int(len(self._all_user_ids) * 0.05))
+        anomaly_users = self.rng.choice(self._all_user_ids, size=num_anomaly_users, replace=False)
+        
+        # 10-30 failed login attempts per user, each burst lasting 10 minutes to 2 hours
+        attempts = self.rng.integers(10, 31, num_anomaly_users)
+        total = attempts.sum()
+        burst_starts = np.repeat(self._days_ago(1, 25, num_anomaly_users), attempts)
+        burst_seconds = np.repeat(self.rng.integers(10, 121, num_anomaly_users) * 60, attempts)
+        offsets_ns = (self.rng.uniform(0, burst_seconds, total) * NS_PER_SECOND).astype(np.int64)
+        timestamps = burst_starts + offsets_ns.astype('timedelta64[ns]')
+        
+        # Mix of suspicious and normal IPs during attack (60% from suspicious IPs)
+        tenant_ids, user_ids, typical_ips = self._repeat_users(anomaly_users, attempts)
+        ip_addresses = np.where(
+            self.rng.random(total) < 0.6,
+            self.rng.choice(self.suspicious_ips, total),
+            typical_ips
+        )
+        
+        self._append_events(timestamps, tenant_ids, user_ids, EVENT_CODES['LOGIN'], self._random_resource_ids(total), STATUS_CODES['FAILURE'], ip_addresses)
     
     def _inject_unusual_event_types(self):
         """Inject unusual event types for users based on tenant context"""
@@ -242,196 +296,176 @@ class VaultSphereLogGenerator:
         
         # For IT Solutions Company - inject unusual admin actions by non-admin users
         if 2 in self.users_data:
-            it_users = [(user_id, user_info) for user_id, user_info in self.users_data[2].items() 
+            it_users = [user_id for user_id, user_info in self.users_data[2].items() 
                        if user_info['role'] != 'admin']
             
             if it_users:
                 # Select 5% of non-admin IT users for unusual admin actions
                 num_anomaly_users = max(1, int(len(it_users) * 0.05))
-                anomaly_users = random.sample(it_users, num_anomaly_users)
+                anomaly_users = self.rng.choice(it_users, size=num_anomaly_users, replace=False)
                 
-                for user_id, user_info in anomaly_users:
-                    # Generate 2-4 unusual admin actions
-                    num_actions = random.randint(2, 4)
-                    
-                    for _ in range(num_actions):
-                        timestamp = datetime.now() - timedelta(days=random.uniform(1, 28))
-                        
-                        # Add some time jitter
-                        timestamp += timedelta(
-                            hours=random.randint(0, 23),
-                            minutes=random.randint(0, 59)
-                        )
-                        
-                        self.logs.append({
-                            'timestamp': timestamp,
-                            'tenant_id': user_info['tenant_id'],
-                            'user_id': user_id,
-                            'event_type': 'ADMIN_ACTION',
-                            'resource_id': f"RES_{random.randint(1, 1000)}",
-                            'status': 'SUCCESS',
-                            'ip_address': random.choice(user_info['typical_ips']) if user_info['typical_ips'] else random.choice(self.corporate_ips)
-                        })
+                # Generate 2-4 unusual admin actions per user
+                actions = self.rng.integers(2, 5, num_anomaly_users)
+                total = actions.sum()
+                
+                # Add some time jitter
+                jitter = self.rng.integers(0, 24, total) * 3600 + self.rng.integers(0, 60, total) * 60
+                timestamps = self._days_ago(1, 28, total) + jitter.astype('timedelta64[s]')
+                
+                tenant_ids, user_ids, ip_addresses = self._repeat_users(anomaly_users, actions)
+                self._append_events(timestamps, tenant_ids, user_ids, EVENT_CODES['ADMIN_ACTION'], self._random_resource_ids(total), STATUS_CODES['SUCCESS'], ip_addresses)
         
         # For Food Company - inject unusual complaint patterns
         if 1 in self.users_data:
-            food_users = [(user_id, user_info) for user_id, user_info in self.users_data[1].items()]
+            food_users = list(self.users_data[1])
             
             if food_users:
                 # Select some users for excessive complaints
                 num_anomaly_users = max(1, int(len(food_users) * 0.03))
-                anomaly_users = random.sample(food_users, num_anomaly_users)
+                anomaly_users = self.rng.choice(food_users, size=num_anomaly_users, replace=False)
                 
-                for user_id, user_info in anomaly_users:
-                    # Generate excessive complaints
-                    num_complaints = random.randint(8, 15)
-                    
-                    for _ in range(num_complaints):
-                        timestamp = datetime.now() - timedelta(days=random.uniform(1, 28))
-                        
-                        self.logs.append({
-                            'timestamp': timestamp,
-                            'tenant_id': user_info['tenant_id'],
-                            'user_id': user_id,
-                            'event_type': 'COMPLAINT',
-                            'resource_id': f"RES_{random.randint(1, 1000)}",
-                            'status': 'SUCCESS',
-                            'ip_address': random.choice(user_info['typical_ips']) if user_info['typical_ips'] else random.choice(self.corporate_ips)
-                        })
+                # Generate excessive complaints
+                complaints = self.rng.integers(8, 16, num_anomaly_users)
+                total = complaints.sum()
+                
+                tenant_ids, user_ids, ip_addresses = self._repeat_users(anomaly_users, complaints)
+                self._append_events(self._days_ago(1, 28, total), tenant_ids, user_ids, EVENT_CODES['COMPLAINT'], self._random_resource_ids(total), STATUS_CODES['SUCCESS'], ip_addresses)
     
     def _inject_unusual_ip_access(self):
         """Inject access from unusual IP addresses"""
         print("Injecting unusual IP address anomalies...")
         
         # Select 25 users for unusual IP access
-        all_users = [(user_id, user_info) for tenant_users in self.users_data.values() 
-                     for user_id, user_info in tenant_users.items()]
-        anomaly_users = random.sample(all_users, 25)
+        anomaly_users = self.rng.choice(self._all_user_ids, size=25, replace=False)
         
-        for user_id, user_info in anomaly_users:
-            # Generate 3-8 events from suspicious IPs
-            num_events = random.randint(3, 8)
-            
-            for _ in range(num_events):
-                timestamp = datetime.now() - timedelta(days=random.uniform(1, 25))
-                
-                # Random event type
-                event_type = random.choice(['LOGIN', 'CREATE', 'UPDATE', 'DOWNLOAD'])
-                
-                # Suspicious IP
-                suspicious_ip = random.choice(self.suspicious_ips)
-                
-                # Higher chance of failure from suspicious IPs
-                status = 'SUCCESS' if random.random() < 0.7 else 'FAILURE'
-                
-                self.logs.append({
-                    'timestamp': timestamp,
-                    'tenant_id': user_info['tenant_id'],
-                    'user_id': user_id,
-                    'event_type': event_type,
-                    'resource_id': f"RES_{user_info['tenant_id']}_{random.randint(1000, 9999)}",
-                    'status': status,
-                    'ip_address': suspicious_ip
-                })
+        # Generate 3-8 events from suspicious IPs per user
+        counts = self.rng.integers(3, 9, len(anomaly_users))
+        total = counts.sum()
+        tenant_ids, user_ids, _ = self._repeat_users(anomaly_users, counts)
+        
+        # Random event type
+        event_types = self.rng.choice(UNUSUAL_IP_EVENT_CODES, total)
+        
+        # Suspicious IP
+        ip_addresses = self.rng.choice(self.suspicious_ips, total)
+        
+        # Higher chance of failure from suspicious IPs
+        statuses = (self.rng.random(total) >= 0.7).view(np.uint8)
+        
+        # Tenant-scoped resource ids (RES_<tenant>_1000 to RES_<tenant>_9999)
+        resource_ids = np.char.add(
+            np.char.add(np.char.add('RES_', tenant_ids.astype(str)), '_'),
+            self.rng.integers(1000, 10000, total).astype(str)
+        )
+        
+        self._append_events(self._days_ago(1, 25, total), tenant_ids, user_ids, event_types, resource_ids, statuses, ip_addresses)
     
     def _inject_off_hours_activity(self):
         """Inject suspicious off-hours activity"""
         print("Injecting off-hours activity anomalies...")
         
-        all_users = [(user_id, user_info) for tenant_users in self.users_data.values() 
-                     for user_id, user_info in tenant_users.items()]
-        
         # Select 5% of users for off-hours activity
-        num_anomaly_users = max(2, int(len(all_users) * 0.05))
-        anomaly_users = random.sample(all_users, num_anomaly_users)
-        
-        for user_id, user_info in anomaly_users:
-            # Generate 5-12 events during off hours (11 PM - 5 AM)
-            num_events = random.randint(5, 12)
-            tenant_id = user_info['tenant_id']
-            tenant_config = self.tenant_configs[tenant_id]
-            
-            for _ in range(num_events):
-                timestamp = datetime.now() - timedelta(days=random.uniform(1, 20))
-                
-                # Set to off hours
-                off_hour = random.choice([23, 0, 1, 2, 3, 4, 5])
-                timestamp = timestamp.replace(hour=off_hour, minute=random.randint(0, 59))
-                
-                # Choose appropriate event type based on tenant
-                if tenant_id == 1:  # Food Company
-                    event_type = random.choice(['ORDER', 'PAYMENT', 'UPDATE'])
-                else:  # IT Solutions Company
-                    event_type = random.choice(['UPLOAD', 'DOWNLOAD', 'UPDATE', 'ADMIN_ACTION'])
-                
-                self.logs.append({
-                    'timestamp': timestamp,
-                    'tenant_id': user_info['tenant_id'],
-                    'user_id': user_id,
-                    'event_type': event_type,
-                    'resource_id': f"RES_{random.randint(1, 1000)}",
-                    'status': 'SUCCESS',
-                    'ip_address': random.choice(user_info['typical_ips']) if user_info['typical_ips'] else random.choice(self.corporate_ips)
-                })
+        num_anomaly_users = max(2, int(len(self._all_user_ids) * 0.05))
+        anomaly_users = self.rng.choice(self._all_user_ids, size=num_anomaly_users, replace=False)
+        
+        # Generate 5-12 events per user during off hours (11 PM - 5 AM)
+        counts = self.rng.integers(5, 13, num_anomaly_users)
+        total = counts.sum()
+        tenant_ids, user_ids, ip_addresses = self._repeat_users(anomaly_users, counts)
+        
+        # Set to off hours, keeping the seconds of the original draw
+        timestamps = self._days_ago(1, 20, total)
+        off_hours = self.rng.choice(OFF_HOURS, total)
+        minutes = self.rng.integers(0, 60, total)
+        timestamps = at_time_of_day(timestamps, off_hours, minutes)
+        
+        # Choose appropriate event type based on tenant
+        food_events = self.rng.choice(FOOD_OFF_HOURS_EVENT_CODES, total)  # Food Company
+        it_events = self.rng.choice(IT_OFF_HOURS_EVENT_CODES, total)  # IT Solutions Company
+        event_types = np.where(tenant_ids == 1, food_events, it_events)
+        
+        self._append_events(timestamps, tenant_ids, user_ids, event_types, self._random_resource_ids(total), STATUS_CODES['SUCCESS'], ip_addresses)
     
     def generate_logs(self):
         """Main method to generate all logs"""
         print("🚀 Starting VaultSphere Synthetic Log Generation")
         print("=" * 60)
         
+        # Snapshot the current time once; every timestamp is an offset from it
+        self._now = np.datetime64(datetime.now(), 'ns')
+        
         # Step 1: Create users
         self._create_users()
         
-        # Step 2: Generate normal events for all users
+        # Step 2: Generate normal events for all users, one task per tenant
         print("Generating normal user activity events...")
-        total_users = 0
+        normal_tasks = []
         for tenant_id, tenant_users in self.users_data.items():
             tenant_config = self.tenant_configs[tenant_id]
-            events_per_user = tenant_config['events_per_user']
-            
             print(f"Generating events for {tenant_config['name']} users...")
-            for user_id, user_info in tenant_users.items():
-                normal_events = self._generate_normal_events(user_id, user_info, events_per_user)
-                self.logs.extend(normal_events)
-                total_users += 1
+            normal_tasks.append(('_generate_normal_events_batch', (tenant_id, tenant_users, tenant_config['events_per_user'])))
+        total_users = sum(len(tenant_users) for tenant_users in self.users_data.values())
+        
+        # Step 3: Inject anomalies, one task per injector
+        anomaly_tasks = [
+            ('_inject_failed_login_bursts', ()),
+            ('_inject_unusual_event_types', ()),
+            ('_inject_unusual_ip_access', ()),
+            ('_inject_off_hours_activity', ())
+        ]
         
-        print(f"Generated {len(self.logs)} normal events for {total_users} users")
+        # Run every task in a worker process with its own spawned seed;
+        # results and output are merged in task order once all finish
+        tasks = normal_tasks + anomaly_tasks
+        task_seeds = self.seed_sequence.spawn(len(tasks))
+        with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+            futures = [
+                executor.submit(_run_generator_task, self, method_name, args, seed)
+                for (method_name, args), seed in zip(tasks, task_seeds)
+            ]
+            results = [future.result() for future in futures]
+        
+        for cols, _ in results[:len(normal_tasks)]:
+            self._extend_cols(cols)
+        initial_count = sum(len(batch) for batch in self.cols['timestamp'])
+        print(f"Generated {initial_count} normal events for {total_users} users")
         
-        # Step 3: Inject anomalies
         print("\n🔍 Injecting realistic anomalies...")
-        initial_count = len(self.logs)
+        for cols, output in results[len(normal_tasks):]:
+            print(output, end='')
+            self._extend_cols(cols)
         
-        self._inject_failed_login_bursts()
-        self._inject_unusual_event_types()
-        self._inject_unusual_ip_access()
-        self._inject_off_hours_activity()
+        # Concatenate each column once
+        self.logs = {column: np.concatenate(batches) for column, batches in self.cols.items()}
         
-        anomaly_count = len(self.logs) - initial_count
+        anomaly_count = len(self.logs['timestamp']) - initial_count
         print(f"Injected {anomaly_count} anomalous events")
         
-        # Step 4: Sort logs by timestamp
+        # Step 4: Sort logs by timestamp (stable argsort over int64 nanoseconds)
         print("\nSorting logs by timestamp...")
-        self.logs.sort(key=lambda x: x['timestamp'])
+        ts_ns = self.logs['timestamp'].astype('datetime64[ns]').view(np.int64)
+        order = np.argsort(ts_ns, kind='stable')
+        self.logs = {column: values[order] for column, values in self.logs.items()}
         
-        print(f"\n✅ Total events generated: {len(self.logs)}")
+        print(f"\n✅ Total events generated: {len(self.logs['timestamp'])}")
         return self.logs
     
     def save_to_csv(self, filename='synthetic_vaultsphere_logs.csv'):
         """Save logs to CSV file"""
         print(f"\n💾 Saving logs to {filename}...")
         
-        # Convert to DataFrame
-        df = pd.DataFrame(self.logs)
+        # Convert to DataFrame in the specified column order
+        df = pd.DataFrame({column: self.logs[column] for column in LOG_COLUMNS}, copy=False)
         
-        # Format timestamp
-        df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        # Whole-second timestamps and dotted-quad IPs; decode event types and statuses as categoricals
+        df['timestamp'] = self.logs['timestamp'].astype('datetime64[s]')
+        df['ip_address'] = format_ipv4(df['ip_address'].to_numpy())
+        df['event_type'] = pd.Categorical.from_codes(self.logs['event_type'], categories=EVENT_TYPES)
+        df['status'] = pd.Categorical.from_codes(self.logs['status'], categories=STATUSES)
         
-        # Reorder columns
-        column_order = ['timestamp', 'tenant_id', 'user_id', 'event_type', 'resource_id', 'status', 'ip_address']
-        df = df[column_order]
-        
-        # Save to CSV
-        df.to_csv(filename, index=False)
+        # Save to CSV with Arrow's vectorized writer (timestamp[s] is written as YYYY-MM-DD HH:MM:SS)
+        write_options = pacsv.WriteOptions(batch_size=8192, quoting_style='none', quoting_header='none')
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filename, write_options=write_options)
         
         print(f"✅ Successfully saved {len(df)} events to {filename}")
         
@@ -452,18 +486,30 @@ class VaultSphereLogGenerator:
         
         print("\nEvent Type Distribution:")
         event_counts = df['event_type'].value_counts()
+        event_counts = event_counts[event_counts > 0]
         for event_type, count in event_counts.items():
             percentage = (count / len(df)) * 100
             print(f"  {event_type}: {count:,} ({percentage:.1f}%)")
         
         print("\nStatus Distribution:")
         status_counts = df['status'].value_counts()
+        status_counts = status_counts[status_counts > 0]
         for status, count in status_counts.items():
             percentage = (count / len(df)) * 100
             print(f"  {status}: {count:,} ({percentage:.1f}%)")
         
         return df
 
+def _run_generator_task(generator, method_name, args, seed_sequence):
+    """Run one generation method in a worker process, returning (column arrays, captured output)"""
+    generator.rng = np.random.default_rng(seed_sequence)
+    generator.cols = {column: [] for column in LOG_COLUMNS}
+    output = io.StringIO()
+    with redirect_stdout(output):
+        getattr(generator, method_name)(*args)
+    
+    return generator.cols, output.getvalue()
+
 def main():
     """Main execution function"""
     print("🏢 VaultSphere Multi-Tenant Synthetic Log Generator")
@@ -0,0 +1,37 @@
+"""
+Shared helpers and constants for the VaultSphere log generators and analysis scripts.
+"""
+
+import numpy as np
+
+# Low-cardinality columns are loaded as categoricals so comparisons and groupbys run on integer codes
+LOG_DTYPES = {
+    'tenant_id': 'int8',
+    'user_id': 'category',
+    'event_type': 'category',
+    'status': 'category',
+    'ip_address': 'category'
+}
+
+# Only the columns the analysis reads are parsed; resource_id and other extras are skipped
+LOG_COLUMNS = ['timestamp', *LOG_DTYPES]
+
+# The generators carry IPs as packed uint32 and only format them when saving
+def pack_ipv4(octets):
+    """Pack an (n, 4) array of octets into uint32 addresses"""
+    octets = np.asarray(octets, dtype=np.uint32)
+    return (octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8) | octets[:, 3]
+
+def format_ipv4(addresses):
+    """Format uint32 addresses as dotted-quad strings (each distinct address is formatted once)"""
+    unique_addresses, inverse = np.unique(np.asarray(addresses, dtype=np.uint32), return_inverse=True)
+    dotted = (unique_addresses >> 24).astype(str)
+    for shift in (16, 8, 0):
+        dotted = np.char.add(np.char.add(dotted, '.'), ((unique_addresses >> shift) & 0xFF).astype(str))
+    return dotted[inverse]
+
+def at_time_of_day(timestamps, hours, minutes):
+    """Move datetime64 timestamps to hours:minutes on the same day, keeping their seconds (datetime64[ns])"""
+    days = timestamps.astype('datetime64[D]').astype('datetime64[ns]')
+    seconds = timestamps - timestamps.astype('datetime64[m]')
+    return days + np.asarray(hours).astype('timedelta64[h]') + np.asarray(minutes).astype('timedelta64[m]') + seconds